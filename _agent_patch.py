@@ -0,0 +1,280 @@
+"""
+Orchestrator Agent Patch
+Shared by fix_backend_startup.py and setup_production_env.py: wraps the
+orchestrator agent's load_dotenv() call (and optionally its LangChain imports)
+in error handling so the backend still starts without a usable .env file,
+keeps the record of generated/patched files that lets re-runs skip them, and
+holds the helpers both scripts share (dependency probes, the static startup
+check, stdout buffering)
+"""
+
+import re
+import ast
+import sys
+import importlib.util
+import json
+import mmap
+import threading
+from hashlib import blake2b
+from pathlib import Path
+from typing import Dict, Iterable, List
+
+# Marker written into orchestrator_agent.py once its load_dotenv call is wrapped
+PATCH_SENTINEL = b"# __PATCHED_LOAD_DOTENV__"
+
+# The agent file is patched as bytes, so it is never decoded
+_LOAD_DOTENV_CALL = b"load_dotenv()"
+
+# Only unindented calls are wrapped: an indented call already sits inside a
+# try (or other) block, and the replacement text only fits at column 0
+_TOP_LEVEL_LOAD_DOTENV_RX = re.compile(rb"^load_dotenv\(\)[ \t]*$", re.MULTILINE)
+
+# A run of consecutive `from langchain...` / `import langchain...` lines,
+# compiled once however many scripts import this module
+_LANGCHAIN_RX = re.compile(rb"(?:^[ \t]*(?:from|import)[ \t]+langchain[^\n]*(?:\n|\Z))+", re.MULTILINE)
+
+_LOAD_DOTENV_REPLACEMENT = """try:
+    from dotenv import load_dotenv
+    load_dotenv()
+    print("✅ Environment variables loaded from .env")
+except Exception as e:
+    print(f"⚠️ Warning: Could not load .env file: {e}")
+    print("Continuing with system environment variables...")""".encode("utf-8")
+
+# Setup steps may run concurrently; serialise read-modify-write of the state file
+_STATE_LOCK = threading.Lock()
+
+# module name -> installed, so each dependency is located once per run
+_PROBE_CACHE = {}
+
+_LANGCHAIN_FALLBACK = (
+    "except ImportError as e:\n"
+    "    print(f'⚠️ LangChain import error: {e}')\n"
+    "    print('Using fallback mode without LangChain features')\n"
+    "\n"
+).encode("utf-8")
+
+def _digest(data: bytes) -> str:
+    """Short content hash used to recognise files this script already wrote"""
+    return blake2b(data, digest_size=16).hexdigest()
+
+def _state_key(path: Path) -> str:
+    """Record key for a file: its absolute path, so relative and resolved callers agree"""
+    return str(Path(path).resolve())
+
+def _load_fix_state(state_file: Path) -> dict:
+    """Read the {path: [mtime_ns, size, digest]} record of files already written"""
+    try:
+        return json.loads(state_file.read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return {}
+
+def _is_recorded(path: Path, state: dict) -> bool:
+    """True when the file still has the stat signature recorded for it"""
+    stat = path.stat()
+    return state.get(_state_key(path), [])[:2] == [stat.st_mtime_ns, stat.st_size]
+
+def _record_written(path: Path, state_file: Path, digest: str) -> None:
+    """Remember a file's stat signature and content hash so later runs can skip it"""
+    stat = path.stat()
+    with _STATE_LOCK:
+        state = _load_fix_state(state_file)
+        state[_state_key(path)] = [stat.st_mtime_ns, stat.st_size, digest]
+        try:
+            state_file.write_text(json.dumps(state), encoding='utf-8')
+        except OSError:
+            pass
+
+def _is_patched(agent_file: Path, state_file: Path) -> bool:
+    """
+    True when the agent file is the one this module last wrote
+
+    The stat signature answers without reading the file; if only the
+    mtime moved (a checkout or copy), one hash of the content decides.
+    """
+    state = _load_fix_state(state_file)
+    if _is_recorded(agent_file, state):
+        return True
+    record = state.get(_state_key(agent_file))
+    if record is None or len(record) < 3:
+        return False
+    if _digest(agent_file.read_bytes()) != record[2]:
+        return False
+    _record_written(agent_file, state_file, record[2])
+    return True
+
+def is_current(path: Path, data: bytes, state_file: Path) -> bool:
+    """
+    True when a generated file is untouched since it was last written with this content
+
+    Args:
+        path: Generated file
+        data: Content the file should hold
+        state_file: JSON record of already-written files
+    """
+    try:
+        state = _load_fix_state(state_file)
+        return _is_recorded(path, state) and state[_state_key(path)][2:] == [_digest(data)]
+    except OSError:
+        return False  # not written yet
+
+def write_if_changed(path: Path, data: bytes, state_file: Path) -> bool:
+    """
+    Write a generated file unless it still holds exactly this content
+
+    Args:
+        path: File to write
+        data: Full file content
+        state_file: JSON record of already-written files
+
+    Returns:
+        True if the file was written, False if it was already up to date
+    """
+    if is_current(path, data, state_file):
+        return False
+    path.write_bytes(data)
+    _record_written(path, state_file, _digest(data))
+    return True
+
+def _add_sentinel(content: bytes) -> bytes:
+    """Insert the patch sentinel at the top, after a shebang line if there is one"""
+    if content.startswith(b"#!"):
+        first_line, _, rest = content.partition(b"\n")
+        return first_line + b"\n" + PATCH_SENTINEL + b"\n" + rest
+    return PATCH_SENTINEL + b"\n" + content
+
+def _wrap_langchain_imports(match: "re.Match") -> bytes:
+    """Indent a block of LangChain imports under try/except ImportError"""
+    block = match.group(0)
+    indented = b"".join(b"    " + line for line in block.splitlines(True))
+    if not indented.endswith(b"\n"):
+        indented += b"\n"
+    return b"try:\n" + indented + _LANGCHAIN_FALLBACK
+
+def patch_orchestrator(agent_file: Path, state_file: Path, wrap_langchain: bool = False) -> bool:
+    """
+    Wrap the agent's load_dotenv() call in try/except, once
+
+    Args:
+        agent_file: Path to orchestrator_agent.py
+        state_file: JSON record of already-patched files
+        wrap_langchain: Also guard the LangChain imports against ImportError
+
+    Returns:
+        True if the file was rewritten, False if it was already patched
+        or has nothing to patch
+    """
+    # Already patched on a previous run - nothing to rewrite
+    if _is_patched(agent_file, state_file):
+        return False
+
+    with open(agent_file, 'r+b') as f:
+        # Map the file and search it in place; it is only copied into memory
+        # when there is actually something to patch
+        try:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            return False  # empty file
+        try:
+            if mm.find(PATCH_SENTINEL, 0, min(4096, len(mm))) != -1:
+                return False
+            # Skip files that already carry the wrapper or whose calls are all
+            # nested in a block (wrapped by hand or by an older version of this)
+            if mm.find(_LOAD_DOTENV_REPLACEMENT) != -1 or _TOP_LEVEL_LOAD_DOTENV_RX.search(mm) is None:
+                return False
+            fixed_content = bytearray(mm)
+        finally:
+            mm.close()
+
+        # Splice the replacement over each top-level call in place (last first,
+        # so the earlier offsets stay valid) instead of building a new copy per call
+        indexes = [match.start() for match in _TOP_LEVEL_LOAD_DOTENV_RX.finditer(fixed_content)]
+        for index in reversed(indexes):
+            fixed_content[index:index + len(_LOAD_DOTENV_CALL)] = _LOAD_DOTENV_REPLACEMENT
+
+        # Add import error handling for langchain
+        if wrap_langchain and fixed_content.find(b"from langchain") != -1 and fixed_content.find(b"try:", 0, 500) == -1:
+            fixed_content = _LANGCHAIN_RX.sub(_wrap_langchain_imports, fixed_content)
+
+        patched = _add_sentinel(bytes(fixed_content))
+        f.seek(0)
+        f.write(patched)
+        f.truncate()
+
+    _record_written(agent_file, state_file, _digest(patched))
+    return True
+
+def _local_module_files(root: Path, dotted: str, names: Iterable[str]) -> List[Path]:
+    """Files under root that importing `dotted` (and `names` from it) would execute"""
+    parts = dotted.split(".") if dotted else []
+    files = [root.joinpath(*parts[:i], "__init__.py") for i in range(1, len(parts) + 1)]
+    if parts:
+        files.append(root.joinpath(*parts[:-1], parts[-1] + ".py"))
+    files.extend(root.joinpath(*parts, name + ".py") for name in names)
+    return [path for path in files if path.is_file()]
+
+def parse_backend_modules(root: Path, entries: Iterable[Path]) -> Dict[Path, ast.Module]:
+    """
+    Parse the entry files and every backend module they import, transitively
+
+    Imports are resolved against root (the directory main.py puts on
+    sys.path) and, for relative imports, the importing file's package;
+    anything that does not resolve to a file there is a third-party module
+    and is not followed.
+
+    Args:
+        root: Backend directory
+        entries: Files to start from, e.g. main.py
+
+    Returns:
+        {path: syntax tree} for every module reached
+
+    Raises:
+        OSError: A module could not be read
+        SyntaxError: A module does not parse (its filename is set)
+    """
+    trees = {}
+    pending = [Path(entry).resolve() for entry in entries]
+    root = root.resolve()
+    while pending:
+        path = pending.pop()
+        if path in trees:
+            continue
+        tree = trees[path] = ast.parse(path.read_bytes(), filename=str(path))
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                for alias in node.names:
+                    pending.extend(_local_module_files(root, alias.name, ()))
+            elif isinstance(node, ast.ImportFrom):
+                base = root
+                if node.level:
+                    base = path.parent
+                    for _ in range(node.level - 1):
+                        base = base.parent
+                names = [alias.name for alias in node.names if alias.name != "*"]
+                pending.extend(_local_module_files(base, node.module or "", names))
+    return trees
+
+def find_fastapi_app(tree: ast.AST) -> bool:
+    """True when the module assigns `app = FastAPI(...)` at any level"""
+    for node in ast.walk(tree):
+        if (
+            isinstance(node, ast.Assign)
+            and isinstance(node.value, ast.Call)
+            and isinstance(node.value.func, ast.Name)
+            and node.value.func.id == "FastAPI"
+            and any(isinstance(target, ast.Name) and target.id == "app" for target in node.targets)
+        ):
+            return True
+    return False
+
+def have(module_name: str) -> bool:
+    """Check whether a module is installed without importing it (memoized)"""
+    if module_name not in _PROBE_CACHE:
+        _PROBE_CACHE[module_name] = importlib.util.find_spec(module_name) is not None
+    return _PROBE_CACHE[module_name]
+
+def buffer_stdout():
+    """Stop flushing stdout on every newline; callers flush once per step"""
+    if hasattr(sys.stdout, "reconfigure"):
+        sys.stdout.reconfigure(line_buffering=False)
@@ -22,13 +22,8 @@ from dotenv import load_dotenv
 
 # Load environment variables
 try:
-    try:
-    from dotenv import load_dotenv
     load_dotenv()
     print("✅ Environment variables loaded from .env")
-except Exception as e:
-    print(f"⚠️ Warning: Could not load .env file: {e}")
-    print("Continuing with system environment variables...")
 except Exception as e:
     print(f"⚠️ Warning: Could not load .env file: {e}")
     print("Continuing with environment variables or defaults...")
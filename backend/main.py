@@ -20,6 +20,7 @@ import os
 import sys
 import subprocess
 import socket
+import importlib.util
 from pathlib import Path
 
 # Add the backend directory to Python path for imports
@@ -555,6 +556,10 @@ def main():
     print(f"Database: {'SQLite' if USE_DATABASE else 'In-Memory'}")
     print(f"LangChain: {'[OK] Available' if USE_LANGCHAIN else '[ERROR] Unavailable'}")
     
+    # uvicorn's default "auto" loop picks uvloop where installed (not on Windows)
+    loop = "uvloop" if importlib.util.find_spec("uvloop") is not None else "asyncio"
+    print(f"Event Loop: {loop}")
+    
     # Model info
     if USE_LANGCHAIN:
         try:
@@ -6,7 +6,7 @@ Enhanced with multi-modal support for text, files, and images
 
 import json
 import asyncio
-from typing import Optional, List, AsyncGenerator
+from typing import Optional, List, Tuple, AsyncGenerator
 from fastapi import APIRouter, HTTPException, Depends, Form, File, UploadFile, Request
 from fastapi.responses import JSONResponse, StreamingResponse
 from sqlalchemy.orm import Session
@@ -16,7 +16,7 @@ from utils.database import get_db
 from schemas.chat import ChatRequest, DebugChatRequest
 from schemas.response import ChatResponse, MultimodalChatResponse
 from agents.orchestrator_agent import agent_manager
-from utils.file_parser import parse_file_by_type, detect_file_type
+from utils.file_parser import aparse_file_by_type, detect_file_type
 from utils.embedding_manager import embedding_manager
 
 router = APIRouter()
@@ -72,63 +72,87 @@ async def process_uploaded_files(files: List[UploadFile]) -> str:
     if not files:
         return ""
     
-    file_contents = []
+    # Files are parsed concurrently; output keeps upload order
+    results = await asyncio.gather(
+        *(_process_uploaded_file(i, file) for i, file in enumerate(files))
+    )
+    file_contents = [part for parts, _ in results for part in parts]
     
-    for i, file in enumerate(files):
-        try:
-            print(f"📄 Processing file {i+1}: {file.filename}")
-            
-            # Read file content
-            content = await file.read()
-            
-            # Validate file size (10MB limit)
-            MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB
-            if len(content) > MAX_FILE_SIZE:
-                file_contents.append(f"[File {file.filename}: Too large (max 10MB)]")
-                continue
-            
-            if len(content) == 0:
-                file_contents.append(f"[File {file.filename}: Empty file]")
-                continue
-            
-            # Detect and parse file
-            file_type = detect_file_type(file.filename, file.content_type)
-            
-            if file_type == "unknown":
-                # Try to decode as text
-                try:
-                    text_content = content.decode('utf-8')[:1000]
-                    file_contents.append(f"=== File: {file.filename} (Text) ===\n{text_content}\n")
-                except:
-                    file_contents.append(f"[File {file.filename}: Unsupported file type]")
+    # Optionally create embeddings for future retrieval, one file at a time
+    # so this request does not race itself on the shared vector store
+    if embedding_manager.is_available():
+        for file, (_, text) in zip(files, results):
+            if text is None:
                 continue
-            
-            # Parse the file
-            parse_result = parse_file_by_type(file.filename, content)
-            
-            if "Error parsing" not in parse_result["text"]:
-                file_contents.append(f"=== File: {file.filename} ({file_type.upper()}) ===")
-                file_contents.append(f"Preview: {parse_result['preview']}")
-                file_contents.append(f"Content:\n{parse_result['text']}")
-                file_contents.append("=" * 50)
-                
-                # Optionally create embeddings for future retrieval
-                if embedding_manager.is_available():
-                    try:
-                        embedding_manager.embed_file_content(parse_result["text"], file.filename)
-                        print(f"✅ Created embeddings for {file.filename}")
-                    except Exception as e:
-                        print(f"⚠️ Embedding error for {file.filename}: {e}")
-                        
-            else:
-                file_contents.append(f"[File {file.filename}: {parse_result['text']}]")
-                
-        except Exception as e:
-            print(f"❌ Error processing file {file.filename}: {e}")
-            file_contents.append(f"[File {file.filename}: Error processing - {str(e)}]")
+            try:
+                await embedding_manager.aembed_file_content(text, file.filename)
+                print(f"✅ Created embeddings for {file.filename}")
+            except Exception as e:
+                print(f"⚠️ Embedding error for {file.filename}: {e}")
     
     return "\n\n".join(file_contents)
 
+async def _process_uploaded_file(i: int, file: UploadFile) -> Tuple[List[str], Optional[str]]:
+    """
+    Parse a single uploaded file
+    
+    Args:
+        i: Position of the file in the upload
+        file: Uploaded file
+        
+    Returns:
+        Tuple of (formatted content parts for this file, parsed text to
+        embed or None)
+    """
+    parts = []
+    parsed_text = None
+    
+    try:
+        print(f"📄 Processing file {i+1}: {file.filename}")
+        
+        # Read file content
+        content = await file.read()
+        
+        # Validate file size (10MB limit)
+        MAX_FILE_SIZE = 10 * 1024 * 1024  # 10MB
+        if len(content) > MAX_FILE_SIZE:
+            parts.append(f"[File {file.filename}: Too large (max 10MB)]")
+            return parts, parsed_text
+        
+        if len(content) == 0:
+            parts.append(f"[File {file.filename}: Empty file]")
+            return parts, parsed_text
+        
+        # Detect and parse file
+        file_type = detect_file_type(file.filename, file.content_type)
+        
+        if file_type == "unknown":
+            # Try to decode as text
+            try:
+                text_content = content.decode('utf-8')[:1000]
+                parts.append(f"=== File: {file.filename} (Text) ===\n{text_content}\n")
+            except:
+                parts.append(f"[File {file.filename}: Unsupported file type]")
+            return parts, parsed_text
+        
+        # Parse the file
+        parse_result = await aparse_file_by_type(file.filename, content)
+        
+        if "Error parsing" not in parse_result["text"]:
+            parts.append(f"=== File: {file.filename} ({file_type.upper()}) ===")
+            parts.append(f"Preview: {parse_result['preview']}")
+            parts.append(f"Content:\n{parse_result['text']}")
+            parts.append("=" * 50)
+            parsed_text = parse_result["text"]
+        else:
+            parts.append(f"[File {file.filename}: {parse_result['text']}]")
+            
+    except Exception as e:
+        print(f"❌ Error processing file {file.filename}: {e}")
+        parts.append(f"[File {file.filename}: Error processing - {str(e)}]")
+    
+    return parts, parsed_text
+
 async def enhance_message_with_context(message: str, files: List[UploadFile] = None) -> str:
     """
     Enhance user message with file content and optionally with embedding retrieval
@@ -152,7 +176,7 @@ async def enhance_message_with_context(message: str, files: List[UploadFile] = N
     # Add embedding-based context if available and no files uploaded
     if not files and embedding_manager.is_available() and embedding_manager.vector_store is not None:
         try:
-            retrieval_context = embedding_manager.get_retrieval_context(message, max_chunks=3)
+            retrieval_context = await embedding_manager.aget_retrieval_context(message, max_chunks=3)
             if retrieval_context:
                 enhanced_parts.append(retrieval_context)
                 print(f"✅ Added embedding-based context")
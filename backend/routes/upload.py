@@ -2,7 +2,7 @@ from fastapi import APIRouter, UploadFile, File, Depends, HTTPException, Form, R
 from sqlalchemy.orm import Session
 from utils.database import get_db, FileUpload
 from schemas.response import FileUploadResponse
-from utils.file_parser import parse_file_by_type, detect_file_type
+from utils.file_parser import aparse_file_by_type, detect_file_type
 from utils.embedding_manager import embedding_manager
 from typing import Optional
 import uuid
@@ -52,9 +52,9 @@ async def upload_file(
             print(f"❌ Unsupported file type")
             raise HTTPException(status_code=400, detail="Unsupported file type.")
         
-        # Parse file content using the new parse_file_by_type function
+        # Parse file content off the event loop
         print(f"🔄 Parsing file content...")
-        parse_result = parse_file_by_type(file.filename, content)
+        parse_result = await aparse_file_by_type(file.filename, content)
         
         if "Error parsing" in parse_result["text"]:
             print(f"❌ File parsing error: {parse_result['text']}")
@@ -81,7 +81,7 @@ async def upload_file(
         if embedding_manager.is_available():
             try:
                 print(f"🔄 Creating embeddings...")
-                embedding_success, chunks = embedding_manager.embed_file_content(
+                embedding_success, chunks = await embedding_manager.aembed_file_content(
                     parse_result["text"], 
                     file.filename
                 )
@@ -0,0 +1,83 @@
+"""
+Persistent Embedding Cache
+Stores embedding vectors in SQLite keyed by (content hash, model) so text that
+was embedded once is never sent to the embeddings API again, even across restarts
+"""
+
+import sqlite3
+import threading
+from typing import Dict, List, Mapping, Sequence
+
+import numpy as np
+
+# SQLite caps the number of bound parameters per statement
+_LOOKUP_BATCH = 500
+
+class EmbeddingCache:
+    """
+    Disk-backed map of content digest -> embedding vector for one model
+
+    Vectors are stored as float16 blobs (half the size of float32); the
+    precision loss is far below what cosine ranking can distinguish.
+    """
+
+    def __init__(self, path: str, model: str):
+        """
+        Open (or create) the cache database
+
+        Args:
+            path: SQLite database file
+            model: Embedding model name; entries from other models are ignored
+        """
+        self.model = model
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings ("
+            "hash BLOB NOT NULL, model TEXT NOT NULL, vector BLOB NOT NULL, "
+            "PRIMARY KEY (hash, model)) WITHOUT ROWID"
+        )
+        self._conn.commit()
+
+    def get_many(self, hashes: Sequence[bytes]) -> Dict[bytes, List[float]]:
+        """
+        Look up cached vectors
+
+        Args:
+            hashes: Content digests to look up
+
+        Returns:
+            Dictionary of digest -> vector for the digests that were cached
+        """
+        found = {}
+        with self._lock:
+            for start in range(0, len(hashes), _LOOKUP_BATCH):
+                batch = hashes[start:start + _LOOKUP_BATCH]
+                placeholders = ",".join("?" * len(batch))
+                rows = self._conn.execute(
+                    f"SELECT hash, vector FROM embeddings WHERE model = ? AND hash IN ({placeholders})",
+                    (self.model, *batch)
+                )
+                for key, blob in rows:
+                    found[key] = np.frombuffer(blob, dtype=np.float16).astype(np.float32).tolist()
+        return found
+
+    def put_many(self, vectors: Mapping[bytes, Sequence[float]]) -> None:
+        """
+        Store vectors in the cache
+
+        Args:
+            vectors: Dictionary of content digest -> vector
+        """
+        rows = [
+            (key, self.model, np.asarray(vector, dtype=np.float16).tobytes())
+            for key, vector in vectors.items()
+        ]
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (hash, model, vector) VALUES (?, ?, ?)",
+                rows
+            )
+            self._conn.commit()
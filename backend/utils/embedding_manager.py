@@ -4,36 +4,117 @@ Handles text chunking, embedding generation, and retrieval using LangChain and F
 """
 
 import os
-from typing import List, Dict, Any, Optional, Tuple
+import math
+import asyncio
+import pickle
+import threading
+from collections import Counter
 from datetime import datetime
+from hashlib import blake2b
+from typing import List, Dict, Any, Optional, Tuple
 import json
 
 try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import faiss
     from langchain.text_splitter import RecursiveCharacterTextSplitter
     from langchain_openai import OpenAIEmbeddings
     from langchain_community.vectorstores import FAISS
-    from langchain.schema import Document
+    from langchain_community.vectorstores.utils import DistanceStrategy
+    from .embedding_cache import EmbeddingCache
     EMBEDDING_AVAILABLE = True
 except ImportError as e:
     print(f"⚠️ Embedding dependencies not available: {e}")
     EMBEDDING_AVAILABLE = False
 
+# Vector index compression settings
+# Below COMPRESS_THRESHOLD chunks the exact flat index is kept; once the corpus
+# grows past it, the flat index is replaced by a trained IVF index whose codec
+# is chosen by EMBEDDING_INDEX_CODEC:
+#   "pq"   - 4-bit FastScan PQ, 48 sub-quantizers (24 bytes/vector instead of 6 KB)
+#   "sq8"  - int8 scalar quantization (1.5 KB/vector, ~99% recall)
+#   "flat" - never compress, always exact search
+COMPRESS_THRESHOLD = 10000
+INDEX_CODECS = {"pq": "PQ48x4fs", "sq8": "SQ8"}
+# 4-bit FastScan has no GPU implementation; GPU hosts use 8-bit PQ codes
+GPU_INDEX_CODECS = {"pq": "PQ48", "sq8": "SQ8"}
+MAX_IVF_LISTS = 4096
+DEFAULT_NPROBE = 16
+
+# Async ingestion: chunks per embedding request, and how many of those
+# requests one file may have in flight at once
+EMBED_BATCH_SIZE = 32
+PIPELINE_DEPTH = 4
+
+# Default persistent embedding cache, kept in backend/ whatever the working directory
+DEFAULT_CACHE_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "embedding_cache.db")
+
+# Chunking parameters for the LangChain splitter
+CHUNK_SIZE = 1000
+CHUNK_OVERLAP = 200
+
+def _json_dumps(obj: Any) -> bytes:
+    """Serialize to compact JSON bytes (orjson when installed)"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY)
+    return json.dumps(obj, separators=(",", ":")).encode("utf-8")
+
+def _json_loads(raw: bytes) -> Any:
+    """Parse JSON bytes (orjson when installed)"""
+    return orjson.loads(raw) if orjson is not None else json.loads(raw)
+
+def _content_hash(content: str) -> bytes:
+    """128-bit digest identifying a chunk's exact text"""
+    return blake2b(content.encode("utf-8"), digest_size=16).digest()
+
 class EmbeddingManager:
     """
     Manages file content embedding and retrieval for enhanced chat context
     """
     
-    def __init__(self, openai_api_key: Optional[str] = None):
+    def __init__(
+        self,
+        openai_api_key: Optional[str] = None,
+        nprobe: int = DEFAULT_NPROBE,
+        compress_threshold: int = COMPRESS_THRESHOLD,
+        index_codec: Optional[str] = None,
+        cache_path: Optional[str] = None
+    ):
         """
         Initialize embedding manager
         
         Args:
             openai_api_key: OpenAI API key for embeddings (fallback to env var)
+            nprobe: Number of IVF lists scanned per query once the index is compressed
+            compress_threshold: Chunk count at which the flat index is swapped for a compressed IVF index
+            index_codec: "pq", "sq8" or "flat" (fallback to EMBEDDING_INDEX_CODEC env var, then "pq")
+            cache_path: SQLite file for the persistent embedding cache (fallback to
+                EMBEDDING_CACHE_PATH env var, then backend/embedding_cache.db; "" disables it)
         """
         self.embeddings = None
         self.vector_store = None
         self.text_splitter = None
         self.chunks_metadata = []
+        # Chunks per source, kept in step with chunks_metadata for get_stats
+        self._source_counts: Counter = Counter()
+        # Content digest -> chunk_id of the chunk whose vector holds that text
+        self._content_hashes: Dict[bytes, str] = {}
+        self.nprobe = nprobe
+        self.compress_threshold = compress_threshold
+        self.index_codec = (index_codec or os.getenv("EMBEDDING_INDEX_CODEC", "pq")).lower()
+        # Path of the on-disk index while it is memory-mapped read-only
+        self._mmap_index_path = None
+        self._index_compressed = False
+        self._index_on_gpu = False
+        self._gpu_resources = None
+        self._cache = None
+        # Serialises dedupe -> index insert -> metadata update across the
+        # request threads and event loop tasks that share this manager
+        self._write_lock = threading.Lock()
         
         if not EMBEDDING_AVAILABLE:
             print("⚠️ Embedding functionality disabled - missing dependencies")
@@ -46,12 +127,30 @@ class EmbeddingManager:
                 print("⚠️ No OpenAI API key found - embedding functionality disabled")
                 return
                 
-            self.embeddings = OpenAIEmbeddings(openai_api_key=api_key)
+            self.embeddings = OpenAIEmbeddings(
+                openai_api_key=api_key,
+                max_retries=3,
+                request_timeout=30
+            )
+            
+            # Reuse vectors computed by earlier runs for identical text
+            cache_path = os.getenv("EMBEDDING_CACHE_PATH", DEFAULT_CACHE_PATH) if cache_path is None else cache_path
+            if cache_path:
+                try:
+                    model_name = getattr(self.embeddings, "model", type(self.embeddings).__name__)
+                    self._cache = EmbeddingCache(cache_path, model_name)
+                except Exception as e:
+                    print(f"⚠️ Embedding cache disabled: {e}")
+            
+            # Offload search to the GPU when faiss-gpu and a CUDA device are present
+            if hasattr(faiss, "StandardGpuResources") and faiss.get_num_gpus() > 0:
+                self._gpu_resources = faiss.StandardGpuResources()
+                print("✅ FAISS GPU resources initialized")
             
             # Initialize text splitter
             self.text_splitter = RecursiveCharacterTextSplitter(
-                chunk_size=1000,
-                chunk_overlap=200,
+                chunk_size=CHUNK_SIZE,
+                chunk_overlap=CHUNK_OVERLAP,
                 length_function=len,
                 separators=["\n\n", "\n", " ", ""]
             )
@@ -82,23 +181,9 @@ class EmbeddingManager:
         
         try:
             # Split text into chunks
-            chunks = self.text_splitter.split_text(text)
-            
-            # Create chunk metadata
-            chunk_data = []
-            for i, chunk in enumerate(chunks):
-                chunk_info = {
-                    "content": chunk,
-                    "source": source,
-                    "chunk_index": i,
-                    "created_at": datetime.now().isoformat(),
-                    "metadata": {
-                        "length": len(chunk),
-                        "source_file": source,
-                        "chunk_id": f"{source}_{i}"
-                    }
-                }
-                chunk_data.append(chunk_info)
+            chunks = self._split_text(text)
+            
+            chunk_data = self._build_chunk_data(chunks, source)
             
             print(f"✅ Created {len(chunk_data)} chunks from {source}")
             return chunk_data
@@ -107,6 +192,40 @@ class EmbeddingManager:
             print(f"❌ Error creating chunks: {e}")
             return []
 
+    def _split_text(self, text: str) -> List[str]:
+        """Split text with the configured splitter"""
+        return self.text_splitter.split_text(text)
+
+    def _build_chunk_data(self, chunks: List[str], source: str) -> List[Dict[str, Any]]:
+        """
+        Wrap already-split text chunks with metadata
+        
+        Args:
+            chunks: Text chunks in document order
+            source: Source identifier (filename)
+            
+        Returns:
+            List of chunk dictionaries with metadata
+        """
+        # Loop invariants are computed once rather than per chunk
+        created_at = datetime.now().isoformat()
+        id_prefix = f"{source}_"
+        
+        return [
+            {
+                "content": chunk,
+                "source": source,
+                "chunk_index": i,
+                "created_at": created_at,
+                "metadata": {
+                    "length": len(chunk),
+                    "source_file": source,
+                    "chunk_id": id_prefix + str(i)
+                }
+            }
+            for i, chunk in enumerate(chunks)
+        ]
+
     def embed_chunks(self, chunks: List[Dict[str, Any]]) -> bool:
         """
         Create embeddings for text chunks and store in FAISS
@@ -121,32 +240,239 @@ class EmbeddingManager:
             return False
         
         try:
-            # Convert chunks to LangChain Documents
-            documents = []
-            for chunk in chunks:
-                doc = Document(
-                    page_content=chunk["content"],
-                    metadata=chunk["metadata"]
-                )
-                documents.append(doc)
+            # Embed shortest first so each embedding request batches chunks of
+            # similar size; metadata travels with each vector, so insertion
+            # order does not matter
+            by_length = sorted(self._unembedded(chunks), key=lambda c: len(c["content"]))
+            texts = [chunk["content"] for chunk in by_length]
+            
+            vectors = []
+            if texts:
+                keys, vectors, misses = self._lookup_cached(texts)
+                if misses:
+                    computed = self.embeddings.embed_documents([texts[i] for i in misses])
+                    self._store_cached(keys, vectors, misses, computed)
+            
+            self._commit_vectors(chunks, by_length, vectors)
+            return True
+            
+        except Exception as e:
+            print(f"❌ Error embedding chunks: {e}")
+            return False
+
+    def _record_chunks(self, chunks: List[Dict[str, Any]]) -> None:
+        """Append embedded chunks to chunks_metadata and the per-source counts"""
+        self.chunks_metadata.extend(chunks)
+        self._source_counts.update(chunk.get("source", "unknown") for chunk in chunks)
+
+    def _unembedded(self, chunks: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Chunks whose text is not in the store yet, deduplicated within the list
+        
+        A lock-free first pass so known text is not sent for embedding;
+        _commit_vectors repeats the check under the write lock.
+        """
+        seen = set()
+        fresh = []
+        for chunk in chunks:
+            key = _content_hash(chunk["content"])
+            if key not in self._content_hashes and key not in seen:
+                seen.add(key)
+                fresh.append(chunk)
+        return fresh
+
+    def _commit_vectors(
+        self,
+        chunks: List[Dict[str, Any]],
+        embedded: List[Dict[str, Any]],
+        vectors: List[List[float]]
+    ) -> None:
+        """
+        Add one file's vectors to the store and record its chunks, atomically
+        
+        Runs under the write lock, so concurrent uploads cannot both create
+        the store or interleave their inserts. Duplicates are resolved here
+        against the map as it is now, which also covers text that another
+        upload stored while these vectors were being computed. Nothing is
+        recorded unless the insert succeeds.
+        
+        Args:
+            chunks: Every chunk of the file, in document order
+            embedded: The chunks that were sent for embedding
+            vectors: One embedding per chunk in embedded, in the same order
+        """
+        vector_by_id = {
+            chunk["metadata"]["chunk_id"]: vector for chunk, vector in zip(embedded, vectors)
+        }
+        
+        with self._write_lock:
+            fresh, new_hashes = self._dedupe_chunks(chunks)
+            if not fresh:
+                self._record_chunks(chunks)
+                print(f"✅ All {len(chunks)} chunks already embedded - skipped")
+                return
             
             # Create or update FAISS vector store
-            if self.vector_store is None:
-                self.vector_store = FAISS.from_documents(documents, self.embeddings)
-                print(f"✅ Created new FAISS vector store with {len(documents)} documents")
+            created = self.vector_store is None
+            self._add_vectors(fresh, [vector_by_id[chunk["metadata"]["chunk_id"]] for chunk in fresh])
+            if created:
+                print(f"✅ Created new FAISS vector store with {len(fresh)} documents")
             else:
-                # Add new documents to existing store
-                self.vector_store.add_documents(documents)
-                print(f"✅ Added {len(documents)} documents to existing vector store")
+                print(f"✅ Added {len(fresh)} documents to existing vector store")
+            
+            self._maybe_compress_index()
             
             # Store metadata
-            self.chunks_metadata.extend(chunks)
+            self._content_hashes.update(new_hashes)
+            self._record_chunks(chunks)
+
+    def _dedupe_chunks(self, chunks: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], Dict[bytes, str]]:
+        """
+        Drop chunks whose exact text is already embedded
+        
+        Duplicates stay in the chunk list with metadata["duplicate_of"] set to
+        the chunk_id that owns the vector. New digests are returned rather than
+        recorded so a failed embedding call leaves the map untouched.
+        
+        Args:
+            chunks: Chunk dictionaries about to be embedded
             
-            return True
+        Returns:
+            Tuple of (chunks that need embedding, digests of those chunks)
+        """
+        fresh = []
+        new_hashes = {}
+        for chunk in chunks:
+            key = _content_hash(chunk["content"])
+            original = self._content_hashes.get(key) or new_hashes.get(key)
+            if original is None:
+                new_hashes[key] = chunk["metadata"]["chunk_id"]
+                fresh.append(chunk)
+            else:
+                chunk["metadata"]["duplicate_of"] = original
+        return fresh, new_hashes
+
+    def _lookup_cached(self, texts: List[str]) -> Tuple[List[bytes], List[Optional[List[float]]], List[int]]:
+        """
+        Fetch already-computed embeddings from the persistent cache
+        
+        Args:
+            texts: Texts about to be embedded
+            
+        Returns:
+            Tuple of (content digests, vectors with None for misses, indices of misses)
+        """
+        keys = [_content_hash(text) for text in texts]
+        cached = self._cache.get_many(keys) if self._cache is not None else {}
+        vectors = [cached.get(key) for key in keys]
+        misses = [i for i, vector in enumerate(vectors) if vector is None]
+        return keys, vectors, misses
+
+    def _store_cached(
+        self,
+        keys: List[bytes],
+        vectors: List[Optional[List[float]]],
+        misses: List[int],
+        computed: List[List[float]]
+    ) -> None:
+        """Fill cache misses in place with freshly computed vectors and persist them"""
+        for i, vector in zip(misses, computed):
+            vectors[i] = vector
+        if self._cache is not None:
+            try:
+                self._cache.put_many({keys[i]: vectors[i] for i in misses})
+            except Exception as e:
+                print(f"⚠️ Could not write embedding cache: {e}")
+
+    def _add_vectors(self, chunks: List[Dict[str, Any]], vectors: List[List[float]]) -> None:
+        """
+        Insert pre-computed embeddings into the FAISS vector store
+        
+        Args:
+            chunks: Chunk dictionaries the vectors were computed from
+            vectors: One embedding per chunk, in the same order
+        """
+        text_embeddings = [(chunk["content"], vector) for chunk, vector in zip(chunks, vectors)]
+        metadatas = [chunk["metadata"] for chunk in chunks]
+        
+        if self.vector_store is None:
+            self.vector_store = FAISS.from_embeddings(
+                text_embeddings,
+                self.embeddings,
+                metadatas=metadatas,
+                normalize_L2=True,
+                distance_strategy=DistanceStrategy.MAX_INNER_PRODUCT
+            )
+            self._index_compressed = False
+            self._index_on_gpu = False
+            self._move_index_to_gpu()
+        else:
+            self._ensure_writable_index()
+            self.vector_store.add_embeddings(text_embeddings, metadatas=metadatas)
+
+    def _maybe_compress_index(self) -> None:
+        """
+        Replace the exact flat index with a trained, quantized IVF index once
+        the corpus is large enough for compression to pay off
+        """
+        index = self.vector_store.index
+        if self._index_compressed or index.ntotal < self.compress_threshold:
+            return
+        
+        codecs = GPU_INDEX_CODECS if self._gpu_resources is not None else INDEX_CODECS
+        code_spec = codecs.get(self.index_codec)
+        if code_spec is None:
+            return
+        
+        try:
+            # ~4*sqrt(N) lists keeps every list populated enough to train on
+            nlist = min(MAX_IVF_LISTS, max(1, int(4 * math.sqrt(index.ntotal))))
+            compressed = faiss.index_factory(index.d, f"IVF{nlist},{code_spec}", index.metric_type)
+            
+            vectors = index.reconstruct_n(0, index.ntotal)
+            compressed.train(vectors)
+            compressed.add(vectors)
+            
+            self.vector_store.index = compressed
+            self._index_compressed = True
+            self._index_on_gpu = False
+            self._move_index_to_gpu()
+            self._apply_search_params()
+            print(f"✅ Compressed vector store to IVF{nlist},{code_spec} ({index.ntotal} vectors)")
             
         except Exception as e:
-            print(f"❌ Error embedding chunks: {e}")
-            return False
+            # Keep serving from the exact index if training fails
+            print(f"⚠️ Index compression skipped: {e}")
+
+    def _ensure_writable_index(self) -> None:
+        """Read a memory-mapped index fully into RAM before it is modified"""
+        if self._mmap_index_path is None:
+            return
+        
+        self.vector_store.index = faiss.read_index(self._mmap_index_path)
+        self._mmap_index_path = None
+        self._apply_search_params()
+
+    def _move_index_to_gpu(self) -> None:
+        """Copy the current index to GPU 0 when GPU resources are available"""
+        if self._gpu_resources is None or self._index_on_gpu:
+            return
+        
+        try:
+            self.vector_store.index = faiss.index_cpu_to_gpu(self._gpu_resources, 0, self.vector_store.index)
+            self._index_on_gpu = True
+            # The GPU copy is writable, so a memory-mapped source is no longer needed
+            self._mmap_index_path = None
+        except Exception as e:
+            print(f"⚠️ Keeping vector index on CPU: {e}")
+
+    def _apply_search_params(self) -> None:
+        """Apply query-time parameters to the current FAISS index"""
+        if not self._index_compressed:
+            return
+        
+        params = faiss.GpuParameterSpace() if self._index_on_gpu else faiss.ParameterSpace()
+        params.set_index_parameter(self.vector_store.index, "nprobe", self.nprobe)
 
     def embed_file_content(self, text: str, filename: str) -> Tuple[bool, List[Dict[str, Any]]]:
         """
@@ -181,6 +507,57 @@ class EmbeddingManager:
             print(f"❌ Error in embed_file_content: {e}")
             return False, []
 
+    async def aembed_file_content(self, text: str, filename: str) -> Tuple[bool, List[Dict[str, Any]]]:
+        """
+        Async pipeline: chunk, embed and store a file
+        
+        Batches of EMBED_BATCH_SIZE chunks are embedded with up to
+        PIPELINE_DEPTH requests in flight; the vectors are then added to the
+        store in one step, so a failed batch leaves nothing half-inserted
+        
+        Args:
+            text: File content to embed
+            filename: Source filename
+            
+        Returns:
+            Tuple of (success, chunk_metadata)
+        """
+        if not self.is_available():
+            return False, []
+        
+        try:
+            loop = asyncio.get_running_loop()
+            chunks = await loop.run_in_executor(None, self._split_text, text)
+            if not chunks:
+                return False, []
+            chunk_data = self._build_chunk_data(chunks, filename)
+            
+            # Batch in length order so chunks in one request are similarly
+            # sized; chunk_data itself stays in document order
+            by_length = sorted(self._unembedded(chunk_data), key=lambda c: len(c["content"]))
+            in_flight = asyncio.Semaphore(PIPELINE_DEPTH)
+            
+            async def embed(batch):
+                async with in_flight:
+                    texts = [chunk["content"] for chunk in batch]
+                    keys, vectors, misses = await loop.run_in_executor(None, self._lookup_cached, texts)
+                    if misses:
+                        computed = await self.embeddings.aembed_documents([texts[i] for i in misses])
+                        await loop.run_in_executor(None, self._store_cached, keys, vectors, misses, computed)
+                    return vectors
+            
+            batches = [by_length[start:start + EMBED_BATCH_SIZE] for start in range(0, len(by_length), EMBED_BATCH_SIZE)]
+            vectors = [vector for batch_vectors in await asyncio.gather(*map(embed, batches)) for vector in batch_vectors]
+            
+            await loop.run_in_executor(None, self._commit_vectors, chunk_data, by_length, vectors)
+            
+            print(f"✅ Successfully embedded file content: {filename} ({len(chunk_data)} chunks)")
+            return True, chunk_data
+            
+        except Exception as e:
+            print(f"❌ Error in aembed_file_content: {e}")
+            return False, []
+
     def search_similar(self, query: str, k: int = 3) -> List[Dict[str, Any]]:
         """
         Search for similar content using semantic similarity
@@ -190,7 +567,9 @@ class EmbeddingManager:
             k: Number of results to return
             
         Returns:
-            List of similar chunks with metadata
+            List of similar chunks with metadata; similarity_score is the
+            cosine similarity (higher is more similar), or the L2 distance
+            (lower is more similar) for a store loaded from an older L2 index
         """
         if not self.is_available() or self.vector_store is None:
             return []
@@ -198,25 +577,50 @@ class EmbeddingManager:
         try:
             # Perform similarity search
             results = self.vector_store.similarity_search_with_score(query, k=k)
+            return self._format_results(results)
             
-            # Format results
-            similar_chunks = []
-            for doc, score in results:
-                chunk_info = {
-                    "content": doc.page_content,
-                    "metadata": doc.metadata,
-                    "similarity_score": float(score),
-                    "source": doc.metadata.get("source_file", "unknown")
-                }
-                similar_chunks.append(chunk_info)
+        except Exception as e:
+            print(f"❌ Error searching similar content: {e}")
+            return []
+
+    async def asearch_similar(self, query: str, k: int = 3) -> List[Dict[str, Any]]:
+        """
+        Async search_similar: embeds the query with the async OpenAI client
+        instead of blocking a worker thread on the HTTP request
+        
+        Args:
+            query: Search query
+            k: Number of results to return
             
-            print(f"✅ Found {len(similar_chunks)} similar chunks for query")
-            return similar_chunks
+        Returns:
+            List of similar chunks with metadata (see search_similar)
+        """
+        if not self.is_available() or self.vector_store is None:
+            return []
+        
+        try:
+            results = await self.vector_store.asimilarity_search_with_score(query, k=k)
+            return self._format_results(results)
             
         except Exception as e:
             print(f"❌ Error searching similar content: {e}")
             return []
 
+    def _format_results(self, results: List[Tuple[Any, float]]) -> List[Dict[str, Any]]:
+        """Convert (Document, score) pairs into chunk dictionaries"""
+        similar_chunks = []
+        for doc, score in results:
+            chunk_info = {
+                "content": doc.page_content,
+                "metadata": doc.metadata,
+                "similarity_score": float(score),
+                "source": doc.metadata.get("source_file", "unknown")
+            }
+            similar_chunks.append(chunk_info)
+        
+        print(f"✅ Found {len(similar_chunks)} similar chunks for query")
+        return similar_chunks
+
     def get_retrieval_context(self, query: str, max_chunks: int = 3) -> str:
         """
         Get relevant context for a query to enhance chat responses
@@ -232,7 +636,27 @@ class EmbeddingManager:
             return ""
         
         similar_chunks = self.search_similar(query, k=max_chunks)
+        return self._format_context(similar_chunks)
+
+    async def aget_retrieval_context(self, query: str, max_chunks: int = 3) -> str:
+        """
+        Async get_retrieval_context
+        
+        Args:
+            query: User query
+            max_chunks: Maximum number of chunks to include
+            
+        Returns:
+            Formatted context string
+        """
+        if not self.is_available():
+            return ""
         
+        similar_chunks = await self.asearch_similar(query, k=max_chunks)
+        return self._format_context(similar_chunks)
+
+    def _format_context(self, similar_chunks: List[Dict[str, Any]]) -> str:
+        """Render retrieved chunks as a context block for the LLM prompt"""
         if not similar_chunks:
             return ""
         
@@ -266,13 +690,29 @@ class EmbeddingManager:
             return False
         
         try:
-            os.makedirs(path, exist_ok=True)
-            self.vector_store.save_local(path)
-            
-            # Save metadata
-            metadata_path = os.path.join(path, "chunks_metadata.json")
-            with open(metadata_path, 'w') as f:
-                json.dump(self.chunks_metadata, f, indent=2)
+            # Hold off inserts so the index and metadata files match
+            with self._write_lock:
+                os.makedirs(path, exist_ok=True)
+                # Never overwrite the file backing a live memory map
+                self._ensure_writable_index()
+                
+                # Always persist a CPU index so the store loads on any host
+                index = self.vector_store.index
+                if self._index_on_gpu:
+                    self.vector_store.index = faiss.index_gpu_to_cpu(index)
+                try:
+                    self.vector_store.save_local(path)
+                finally:
+                    self.vector_store.index = index
+                
+                # Save metadata (compact; orjson when installed)
+                metadata_path = os.path.join(path, "chunks_metadata.json")
+                with open(metadata_path, 'wb') as f:
+                    f.write(_json_dumps(self.chunks_metadata))
+                
+                hashes_path = os.path.join(path, "content_hashes.json")
+                with open(hashes_path, 'wb') as f:
+                    f.write(_json_dumps({key.hex(): chunk_id for key, chunk_id in self._content_hashes.items()}))
             
             print(f"✅ Vector store saved to {path}")
             return True
@@ -281,12 +721,27 @@ class EmbeddingManager:
             print(f"❌ Error saving vector store: {e}")
             return False
 
-    def load_vector_store(self, path: str) -> bool:
+    async def asave_vector_store(self, path: str) -> bool:
+        """Async save_vector_store: runs the blocking index write in a worker thread"""
+        return await asyncio.get_running_loop().run_in_executor(None, self.save_vector_store, path)
+
+    async def aload_vector_store(self, path: str, allow_dangerous_deserialization: bool = False) -> bool:
+        """Async load_vector_store: runs the blocking index read in a worker thread"""
+        return await asyncio.get_running_loop().run_in_executor(
+            None, self.load_vector_store, path, allow_dangerous_deserialization
+        )
+
+    def load_vector_store(self, path: str, allow_dangerous_deserialization: bool = False) -> bool:
         """
         Load FAISS vector store from disk
         
+        The docstore is unpickled, which can run arbitrary code, so only
+        load stores this application wrote itself.
+        
         Args:
             path: Directory path to load the store from
+            allow_dangerous_deserialization: Confirm the store is trusted
+                (same opt-in FAISS.load_local requires); without it nothing is loaded
             
         Returns:
             bool: Success status
@@ -294,18 +749,66 @@ class EmbeddingManager:
         if not self.is_available():
             return False
         
+        if not allow_dangerous_deserialization:
+            print("❌ Refusing to load vector store: its docstore is a pickle; "
+                  "pass allow_dangerous_deserialization=True for trusted stores only")
+            return False
+        
         try:
             if not os.path.exists(path):
                 print(f"⚠️ Vector store path does not exist: {path}")
                 return False
             
-            self.vector_store = FAISS.load_local(path, self.embeddings)
-            
-            # Load metadata
-            metadata_path = os.path.join(path, "chunks_metadata.json")
-            if os.path.exists(metadata_path):
-                with open(metadata_path, 'r') as f:
-                    self.chunks_metadata = json.load(f)
+            # Swap the whole store in while no insert is running
+            with self._write_lock:
+                # Map the index through the page cache instead of reading it into
+                # RAM; FAISS.load_local has no way to pass IO flags, so rebuild the
+                # wrapper from the files written by save_local
+                index_path = os.path.join(path, "index.faiss")
+                index = faiss.read_index(index_path, faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY)
+                
+                with open(os.path.join(path, "index.pkl"), 'rb') as f:
+                    docstore, index_to_docstore_id = pickle.load(f)
+                
+                # Stores from before the cosine switch are plain L2 indexes;
+                # keep scoring them by distance rather than as inner products
+                cosine = index.metric_type == faiss.METRIC_INNER_PRODUCT
+                self.vector_store = FAISS(
+                    self.embeddings,
+                    index,
+                    docstore,
+                    index_to_docstore_id,
+                    normalize_L2=cosine,
+                    distance_strategy=DistanceStrategy.MAX_INNER_PRODUCT if cosine else DistanceStrategy.EUCLIDEAN_DISTANCE
+                )
+                self._index_compressed = faiss.try_extract_index_ivf(index) is not None
+                # Only IVF inverted lists are actually memory-mapped; a flat
+                # index was read into RAM already and is writable as loaded
+                self._mmap_index_path = index_path if self._index_compressed else None
+                self._index_on_gpu = False
+                self._move_index_to_gpu()
+                self._apply_search_params()
+                
+                # Load metadata
+                metadata_path = os.path.join(path, "chunks_metadata.json")
+                if os.path.exists(metadata_path):
+                    with open(metadata_path, 'rb') as f:
+                        self.chunks_metadata = _json_loads(f.read())
+                self._source_counts = Counter(chunk.get("source", "unknown") for chunk in self.chunks_metadata)
+                
+                # Load dedup map, rebuilding it from metadata for older stores
+                hashes_path = os.path.join(path, "content_hashes.json")
+                if os.path.exists(hashes_path):
+                    with open(hashes_path, 'rb') as f:
+                        self._content_hashes = {
+                            bytes.fromhex(key): chunk_id for key, chunk_id in _json_loads(f.read()).items()
+                        }
+                else:
+                    self._content_hashes = {
+                        _content_hash(chunk["content"]): chunk["metadata"]["chunk_id"]
+                        for chunk in self.chunks_metadata
+                        if "duplicate_of" not in chunk["metadata"]
+                    }
             
             print(f"✅ Vector store loaded from {path}")
             return True
@@ -328,12 +831,9 @@ class EmbeddingManager:
             "sources": []
         }
         
-        if self.chunks_metadata:
-            sources = set()
-            for chunk in self.chunks_metadata:
-                sources.add(chunk.get("source", "unknown"))
-            stats["sources"] = list(sources)
-            stats["unique_sources"] = len(sources)
+        if self._source_counts:
+            stats["sources"] = list(self._source_counts)
+            stats["unique_sources"] = len(self._source_counts)
         
         return stats
 
@@ -1,12 +1,58 @@
 import fitz  # PyMuPDF
 import pandas as pd
 from docx import Document
+from docx.oxml.ns import qn
 import io
+import os
+import asyncio
+import json
+import codecs
+import tempfile
+from hashlib import blake2b
+from itertools import islice
 import mimetypes
-from typing import Dict, Any, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Optional, Tuple
 import csv
 from openpyxl import load_workbook
 
+try:
+    from charset_normalizer import from_bytes as detect_charset
+except ImportError:
+    detect_charset = None
+
+# Bytes inspected when guessing a text file's encoding
+ENCODING_SAMPLE_BYTES = 65536
+
+# Rows read to infer column types and build previews; the rest of the file is
+# only counted, never converted
+CSV_SAMPLE_ROWS = 1000
+XLSX_PREVIEW_ROWS = 5
+
+# WordprocessingML element tags, resolved once
+W_TBL = qn("w:tbl")
+W_TR = qn("w:tr")
+W_TC = qn("w:tc")
+W_P = qn("w:p")
+W_R = qn("w:r")
+W_T = qn("w:t")
+W_TAB = qn("w:tab")
+W_BR = qn("w:br")
+W_CR = qn("w:cr")
+
+# Run content elements that stand for characters other than their text
+# (the same mapping python-docx's Run.text applies)
+DOCX_BREAK_TEXT = {W_TAB: "\t", W_BR: "\n", W_CR: "\n"}
+
+# Parsed outputs are cached on disk by content hash; set FILE_PARSER_NO_CACHE=1 to disable
+PARSE_CACHE_DIR = os.getenv("FILE_PARSER_CACHE_DIR", os.path.join(".cache", "file_parser"))
+PARSE_CACHE_ENABLED = os.getenv("FILE_PARSER_NO_CACHE", "").lower() not in ("1", "true", "yes")
+# Part of every cache key; bump it whenever a parser's output changes so
+# results from the old parser are never served
+PARSER_VERSION = 3
+# Least recently used entries beyond this many are deleted on each write
+PARSE_CACHE_MAX_ENTRIES = 512
+
 def parse_file_by_type(filename: str, content: bytes) -> Dict[str, str]:
     """
     Parse file content based on file type and return text + preview
@@ -20,7 +66,13 @@ def parse_file_by_type(filename: str, content: bytes) -> Dict[str, str]:
     """
     file_type = detect_file_type(filename, None)
     
+    cache_path = _parse_cache_path(filename, content)
+    cached = _read_parse_cache(cache_path)
+    if cached is not None:
+        return cached
+    
     try:
+        metadata = {}
         if file_type == "pdf":
             text, metadata = _parse_pdf_content(content, filename)
             preview = f"{metadata.get('pages', 0)} pages extracted"
@@ -34,15 +86,21 @@ def parse_file_by_type(filename: str, content: bytes) -> Dict[str, str]:
             text, metadata = _parse_docx_content(content, filename)
             preview = f"{metadata.get('paragraphs', 0)} paragraphs, {metadata.get('tables', 0)} tables"
         else:
-            # Default: decode first 1000 chars raw
+            # Default: decode first 1000 chars raw; 1000 characters are at
+            # most 4000 UTF-8 bytes, so never decode more than that
+            head = content[:4000]
             try:
-                text = content.decode('utf-8')[:1000]
+                text = codecs.getincrementaldecoder('utf-8')().decode(head, final=False)[:1000]
                 preview = f"First 1000 characters extracted"
             except UnicodeDecodeError:
-                text = content.decode('latin-1', errors='ignore')[:1000]
+                text = head.decode('latin-1', errors='ignore')[:1000]
                 preview = f"First 1000 characters extracted (latin-1)"
         
-        return {"text": text, "preview": preview}
+        result = {"text": text, "preview": preview}
+        # Parser errors come back as text; only cache real output
+        if "error" not in metadata:
+            _write_parse_cache(cache_path, result)
+        return result
         
     except Exception as e:
         return {
@@ -50,50 +108,128 @@ def parse_file_by_type(filename: str, content: bytes) -> Dict[str, str]:
             "preview": f"Failed to parse {file_type} file"
         }
 
+# Dedicated pool so parsing uploads neither blocks the event loop nor competes
+# with other to_thread work for the default executor
+PARSE_EXECUTOR = ThreadPoolExecutor(
+    max_workers=min(32, (os.cpu_count() or 1) * 2),
+    thread_name_prefix="file-parser"
+)
+
+async def aparse_file_by_type(filename: str, content: bytes) -> Dict[str, str]:
+    """
+    Async parse_file_by_type: parses in PARSE_EXECUTOR so the event loop
+    stays responsive and concurrent uploads parse side by side
+    
+    Args:
+        filename: Name of the uploaded file
+        content: Raw bytes content of the file
+        
+    Returns:
+        dict with keys: "text" (extracted content), "preview" (summary info)
+    """
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(PARSE_EXECUTOR, parse_file_by_type, filename, content)
+
+def _parse_cache_path(filename: str, content: bytes) -> Optional[str]:
+    """Cache file for this upload, keyed by content hash and filename (which appears in the output)"""
+    if not PARSE_CACHE_ENABLED:
+        return None
+    digest = blake2b(content, digest_size=16, salt=PARSER_VERSION.to_bytes(16, "little"))
+    digest.update(filename.encode("utf-8"))
+    return os.path.join(PARSE_CACHE_DIR, f"{digest.hexdigest()}.json")
+
+def _read_parse_cache(path: Optional[str]) -> Optional[Dict[str, str]]:
+    """Return a cached parse result, or None on a miss"""
+    if path is None:
+        return None
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            result = json.load(f)
+        # Touch the entry so eviction sees it as recently used
+        os.utime(path)
+        return result
+    except (OSError, ValueError):
+        return None
+
+def _write_parse_cache(path: Optional[str], result: Dict[str, str]) -> None:
+    """Store a parse result atomically; caching failures never fail the parse"""
+    if path is None:
+        return
+    try:
+        os.makedirs(PARSE_CACHE_DIR, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=PARSE_CACHE_DIR, suffix=".tmp")
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(result, f)
+        os.replace(tmp_path, path)
+        _evict_parse_cache()
+    except OSError as e:
+        print(f"⚠️ Could not write parse cache: {e}")
+
+def _evict_parse_cache() -> None:
+    """Delete the least recently used entries beyond PARSE_CACHE_MAX_ENTRIES"""
+    with os.scandir(PARSE_CACHE_DIR) as it:
+        entries = [entry for entry in it if entry.name.endswith(".json")]
+    if len(entries) <= PARSE_CACHE_MAX_ENTRIES:
+        return
+    entries.sort(key=lambda entry: entry.stat().st_mtime)
+    for entry in entries[:len(entries) - PARSE_CACHE_MAX_ENTRIES]:
+        try:
+            os.remove(entry.path)
+        except FileNotFoundError:
+            pass  # evicted by a concurrent write
+
+# Content-type substrings checked in order, and extension lookups, for detect_file_type
+CONTENT_TYPE_MAPPING = (
+    ("pdf", "pdf"),
+    ("csv", "csv"),
+    ("excel", "xlsx"),
+    ("spreadsheet", "xlsx"),
+    ("word", "docx"),
+    ("document", "docx"),
+    ("text", "text"),
+)
+EXTENSION_MAPPING = {
+    'pdf': 'pdf',
+    'csv': 'csv',
+    'xlsx': 'xlsx',
+    'xls': 'xlsx',
+    'docx': 'docx',
+    'doc': 'docx',
+    'txt': 'text'
+}
+
 def detect_file_type(filename: str, content_type: str = None) -> str:
     """Detect file type from filename and content type"""
     if content_type:
-        if "pdf" in content_type:
-            return "pdf"
-        elif "csv" in content_type:
-            return "csv"
-        elif "excel" in content_type or "spreadsheet" in content_type:
-            return "xlsx"
-        elif "word" in content_type or "document" in content_type:
-            return "docx"
-        elif "text" in content_type:
-            return "text"
+        for needle, file_type in CONTENT_TYPE_MAPPING:
+            if needle in content_type:
+                return file_type
     
     # Fallback to file extension
-    extension = filename.lower().split('.')[-1] if '.' in filename else ""
-    type_mapping = {
-        'pdf': 'pdf',
-        'csv': 'csv',
-        'xlsx': 'xlsx',
-        'xls': 'xlsx',
-        'docx': 'docx',
-        'doc': 'docx',
-        'txt': 'text'
-    }
-    return type_mapping.get(extension, 'unknown')
+    _, dot, extension = filename.rpartition('.')
+    return EXTENSION_MAPPING.get(extension.lower(), 'unknown') if dot else 'unknown'
 
 def _parse_pdf_content(content: bytes, filename: str) -> Tuple[str, Dict[str, Any]]:
     """Parse PDF file using PyMuPDF"""
     try:
         doc = fitz.open(stream=content, filetype="pdf")
-        text_content = []
+        page_count = doc.page_count
+        buffer = io.StringIO()
         
-        for page_num in range(len(doc)):
-            page = doc.load_page(page_num)
-            text_content.append(f"--- Page {page_num + 1} ---\n")
-            text_content.append(page.get_text())
-            text_content.append("\n")
+        # Write pages straight into one buffer; plain "text" extraction skips
+        # the layout analysis the richer flavors do. Pages are extracted
+        # serially: this already runs in a PARSE_EXECUTOR thread, and a
+        # process pool forked from the threaded server could deadlock
+        for page_num, page in enumerate(doc, 1):
+            buffer.write(f"--- Page {page_num} ---\n")
+            buffer.write(page.get_text("text", sort=False))
+            buffer.write("\n")
         
         doc.close()
         
-        full_text = "".join(text_content)
+        full_text = buffer.getvalue()
         metadata = {
-            "pages": len(doc),
+            "pages": page_count,
             "type": "pdf",
             "title": filename
         }
@@ -103,23 +239,50 @@ def _parse_pdf_content(content: bytes, filename: str) -> Tuple[str, Dict[str, An
     except Exception as e:
         return f"Error parsing PDF: {str(e)}", {"error": str(e), "type": "pdf"}
 
+def _detect_encoding(content: bytes) -> str:
+    """Guess the text encoding of raw bytes from a leading sample"""
+    sample = content[:ENCODING_SAMPLE_BYTES]
+    
+    if detect_charset is not None:
+        match = detect_charset(sample).best()
+        if match is not None:
+            # An ASCII-only sample says nothing about the rest of the file;
+            # UTF-8 decodes the same bytes and whatever follows them
+            return "utf-8" if match.encoding == "ascii" else match.encoding
+    
+    # Incremental decode tolerates a multi-byte character cut off by the sample
+    try:
+        codecs.getincrementaldecoder("utf-8")().decode(sample, final=False)
+        return "utf-8"
+    except UnicodeDecodeError:
+        return "latin-1"
+
 def _parse_csv_content(content: bytes, filename: str) -> Tuple[str, Dict[str, Any]]:
     """Parse CSV file using pandas"""
     try:
-        # Try UTF-8 first, then fallback encodings
-        for encoding in ['utf-8', 'latin-1', 'cp1252']:
+        # UTF-8 first; only when that fails is the encoding guessed, and
+        # latin-1 (which decodes any bytes) is the last resort
+        try:
+            df = pd.read_csv(io.BytesIO(content), encoding="utf-8", nrows=CSV_SAMPLE_ROWS)
+        except UnicodeDecodeError:
+            encoding = _detect_encoding(content)
             try:
-                df = pd.read_csv(io.BytesIO(content), encoding=encoding)
-                break
+                df = pd.read_csv(io.BytesIO(content), encoding=encoding, nrows=CSV_SAMPLE_ROWS)
             except UnicodeDecodeError:
-                continue
+                df = pd.read_csv(io.BytesIO(content), encoding="latin-1", nrows=CSV_SAMPLE_ROWS)
+        
+        # Small files were read completely; for larger ones count lines
+        # (approximate if quoted fields contain newlines)
+        if len(df) < CSV_SAMPLE_ROWS:
+            row_count = len(df)
         else:
-            raise ValueError("Could not decode CSV with any supported encoding")
+            line_count = content.count(b"\n") + (0 if content.endswith(b"\n") else 1)
+            row_count = line_count - 1
         
         # Build text representation
         text_parts = [f"CSV File: {filename}\n"]
         text_parts.append(f"Columns: {', '.join(df.columns.tolist())}\n")
-        text_parts.append(f"Rows: {len(df)}\n\n")
+        text_parts.append(f"Rows: {row_count}\n\n")
         
         # Add column info
         text_parts.append("Column Details:\n")
@@ -134,8 +297,8 @@ def _parse_csv_content(content: bytes, filename: str) -> Tuple[str, Dict[str, An
         full_text = "".join(text_parts)
         metadata = {
             "columns": df.columns.tolist(),
-            "rows": len(df),
-            "shape": df.shape,
+            "rows": row_count,
+            "shape": (row_count, df.shape[1]),
             "type": "csv"
         }
         
@@ -145,36 +308,52 @@ def _parse_csv_content(content: bytes, filename: str) -> Tuple[str, Dict[str, An
         return f"Error parsing CSV: {str(e)}", {"error": str(e), "type": "csv"}
 
 def _parse_xlsx_content(content: bytes, filename: str) -> Tuple[str, Dict[str, Any]]:
-    """Parse Excel file using openpyxl and pandas"""
+    """Parse Excel file by streaming rows with openpyxl in read-only mode"""
     try:
-        # Load workbook to get sheet names
-        wb = load_workbook(io.BytesIO(content), read_only=True)
+        # One streaming pass over the workbook: header and sample rows only
+        wb = load_workbook(io.BytesIO(content), read_only=True, data_only=True)
         sheet_names = wb.sheetnames
-        wb.close()
         
         text_parts = [f"Excel File: {filename}\n"]
         text_parts.append(f"Sheets: {', '.join(sheet_names)}\n\n")
         
-        # Parse each sheet with pandas
-        excel_file = pd.ExcelFile(io.BytesIO(content))
-        
-        for sheet_name in sheet_names:
-            try:
-                df = pd.read_excel(excel_file, sheet_name=sheet_name)
-                
-                text_parts.append(f"--- Sheet: {sheet_name} ---\n")
-                text_parts.append(f"Columns: {', '.join(df.columns.tolist())}\n")
-                text_parts.append(f"Rows: {len(df)}\n")
-                
-                # Add sample data (first 5 rows per sheet)
-                if not df.empty:
-                    text_parts.append("Sample Data:\n")
-                    text_parts.append(df.head(5).to_string(index=False))
-                text_parts.append("\n\n")
-                
-            except Exception as sheet_error:
-                text_parts.append(f"--- Sheet: {sheet_name} (Error) ---\n")
-                text_parts.append(f"Could not parse sheet: {str(sheet_error)}\n\n")
+        try:
+            for sheet_name in sheet_names:
+                try:
+                    ws = wb[sheet_name]
+                    rows = list(islice(ws.iter_rows(values_only=True), XLSX_PREVIEW_ROWS + 1))
+                    header = rows[0] if rows else ()
+                    sample = rows[1:]
+                    columns = [
+                        str(value) if value is not None else f"Unnamed: {i}"
+                        for i, value in enumerate(header)
+                    ]
+                    
+                    # Read-only sheets may lack stored dimensions; count by streaming then
+                    if ws.max_row is not None:
+                        row_count = max(ws.max_row - 1, 0)
+                    else:
+                        row_count = max(sum(1 for _ in ws.iter_rows(values_only=True)) - 1, 0)
+                    
+                    text_parts.append(f"--- Sheet: {sheet_name} ---\n")
+                    text_parts.append(f"Columns: {', '.join(columns)}\n")
+                    text_parts.append(f"Rows: {row_count}\n")
+                    
+                    # Add sample data (first 5 rows per sheet)
+                    if sample:
+                        text_parts.append("Sample Data:\n")
+                        text_parts.append(" | ".join(columns))
+                        text_parts.append("\n")
+                        for row in sample:
+                            text_parts.append(" | ".join("" if value is None else str(value) for value in row))
+                            text_parts.append("\n")
+                    text_parts.append("\n\n")
+                    
+                except Exception as sheet_error:
+                    text_parts.append(f"--- Sheet: {sheet_name} (Error) ---\n")
+                    text_parts.append(f"Could not parse sheet: {str(sheet_error)}\n\n")
+        finally:
+            wb.close()
         
         full_text = "".join(text_parts)
         metadata = {
@@ -195,20 +374,23 @@ def _parse_docx_content(content: bytes, filename: str) -> Tuple[str, Dict[str, A
         
         text_parts = [f"Word Document: {filename}\n\n"]
         
-        # Extract paragraphs
-        paragraph_count = 0
-        for para in doc.paragraphs:
-            if para.text.strip():
-                text_parts.append(para.text)
-                text_parts.append("\n")
-                paragraph_count += 1
+        # Extract top-level paragraphs from the XML, joining each one's text
+        # runs once instead of through python-docx Paragraph/Run objects
+        body = doc.element.body
+        paragraphs = [_docx_paragraph_text(para) for para in body.iterchildren(W_P)]
+        paragraphs = [text for text in paragraphs if text.strip()]
+        for text in paragraphs:
+            text_parts.append(text)
+            text_parts.append("\n")
+        paragraph_count = len(paragraphs)
         
-        # Extract tables
+        # Extract tables straight from the XML; python-docx's Table/_Cell
+        # wrappers re-walk the whole table for every cell access
         table_count = 0
-        for table in doc.tables:
+        for table in body.iterchildren(W_TBL):
             text_parts.append(f"\n--- Table {table_count + 1} ---\n")
-            for row in table.rows:
-                row_text = " | ".join([cell.text.strip() for cell in row.cells])
+            for row in table.iterchildren(W_TR):
+                row_text = " | ".join(_docx_cell_text(cell) for cell in row.iterchildren(W_TC))
                 text_parts.append(row_text)
                 text_parts.append("\n")
             table_count += 1
@@ -226,6 +408,19 @@ def _parse_docx_content(content: bytes, filename: str) -> Tuple[str, Dict[str, A
     except Exception as e:
         return f"Error parsing Word document: {str(e)}", {"error": str(e), "type": "docx"}
 
+def _docx_paragraph_text(para) -> str:
+    """Text of a <w:p> element, with tabs and line breaks kept as characters (matches python-docx's Run.text)"""
+    # Only run children count: <w:tab> also appears in <w:pPr> as a tab stop definition
+    return "".join(
+        DOCX_BREAK_TEXT.get(element.tag) or element.text or ""
+        for run in para.iter(W_R)
+        for element in run.iterchildren(W_T, W_TAB, W_BR, W_CR)
+    )
+
+def _docx_cell_text(cell) -> str:
+    """Text of a <w:tc> element, one line per paragraph (matches python-docx's cell.text)"""
+    return "\n".join(_docx_paragraph_text(para) for para in cell.iterchildren(W_P)).strip()
+
 # Legacy FileParser class for backward compatibility
 class FileParser:
     
@@ -237,5 +432,5 @@ class FileParser:
     @staticmethod
     async def parse_file(file_content: bytes, file_type: str, filename: str) -> Tuple[str, Dict[str, Any]]:
         """Legacy method - use parse_file_by_type function instead"""
-        result = parse_file_by_type(filename, file_content)
+        result = await aparse_file_by_type(filename, file_content)
         return result["text"], {"type": file_type, "preview": result["preview"]} 
\ No newline at end of file
@@ -7,6 +7,21 @@ import re
 from typing import Dict, Any, List
 from datetime import datetime
 
+class _PrintableTable(dict):
+    """
+    str.translate table that deletes characters which are neither printable
+    nor whitespace; each code point is classified once, on first sight
+    """
+    
+    def __missing__(self, codepoint: int):
+        char = chr(codepoint)
+        keep = char.isprintable() or char.isspace()
+        self[codepoint] = char if keep else None
+        return self[codepoint]
+
+_PRINTABLE_TABLE = _PrintableTable()
+_WHITESPACE_RE = re.compile(r'\s+')
+
 def format_datetime(dt) -> str:
     """Format datetime for JSON serialization"""
     if isinstance(dt, datetime):
@@ -15,28 +30,24 @@ def format_datetime(dt) -> str:
 
 def format_file_size(size_bytes: int) -> str:
     """Format file size in human readable format"""
-    if size_bytes == 0:
+    if size_bytes <= 0:
         return "0B"
     
-    size_names = ["B", "KB", "MB", "GB"]
-    i = 0
-    size = float(size_bytes)
+    size_names = ("B", "KB", "MB", "GB")
+    # Each unit is 2**10 of the previous, so the bit length picks the unit
+    i = min((int(size_bytes).bit_length() - 1) // 10, len(size_names) - 1)
     
-    while size >= 1024.0 and i < len(size_names) - 1:
-        size /= 1024.0
-        i += 1
-    
-    return f"{size:.1f} {size_names[i]}"
+    return f"{size_bytes / (1 << (10 * i)):.1f} {size_names[i]}"
 
 def clean_text(text: str) -> str:
     """Clean and normalize text"""
     if not text:
         return ""
     
-    # Remove extra whitespace
-    text = re.sub(r'\s+', ' ', text.strip())
     # Remove non-printable characters
-    text = ''.join(char for char in text if char.isprintable() or char.isspace())
+    text = text.translate(_PRINTABLE_TABLE)
+    # Remove extra whitespace
+    text = _WHITESPACE_RE.sub(' ', text.strip())
     
     return text
 
@@ -7,7 +7,20 @@ Usage: python fix_tailwind_validation.py
 """
 
 import os
+import re
 import json
+from pathlib import Path
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# One scan finds every @tailwind directive / PostCSS plugin instead of a
+# separate substring search per name; the files are scanned as raw bytes
+TAILWIND_DIRECTIVE_RE = re.compile(rb"@tailwind\s+(base|components|utilities)")
+POSTCSS_PLUGIN_RE = re.compile(rb"tailwindcss|autoprefixer")
+REQUIRED_DIRECTIVES = ('base', 'components', 'utilities')
 
 def validate_tailwind_setup():
     """Validate TailwindCSS configuration"""
@@ -23,20 +36,20 @@ def validate_tailwind_setup():
         return False
     
     # Check PostCSS config in frontend
-    if os.path.exists('frontend/postcss.config.js'):
+    # (read straight away - a missing file surfaces as FileNotFoundError)
+    try:
+        content = Path('frontend/postcss.config.js').read_bytes()
+    except FileNotFoundError:
+        issues.append("❌ frontend/postcss.config.js missing")
+    except OSError:
+        issues.append("❌ Could not read PostCSS config")
+    else:
         print("✅ frontend/postcss.config.js exists")
         
-        try:
-            with open('frontend/postcss.config.js', 'r') as f:
-                content = f.read()
-                if 'tailwindcss' in content and 'autoprefixer' in content:
-                    print("✅ PostCSS config includes TailwindCSS and Autoprefixer")
-                else:
-                    issues.append("❌ PostCSS config missing TailwindCSS or Autoprefixer")
-        except:
-            issues.append("❌ Could not read PostCSS config")
-    else:
-        issues.append("❌ frontend/postcss.config.js missing")
+        if len(set(POSTCSS_PLUGIN_RE.findall(content))) == 2:
+            print("✅ PostCSS config includes TailwindCSS and Autoprefixer")
+        else:
+            issues.append("❌ PostCSS config missing TailwindCSS or Autoprefixer")
     
     # Check TailwindCSS config
     if os.path.exists('frontend/tailwind.config.js'):
@@ -45,51 +58,54 @@ def validate_tailwind_setup():
         issues.append("❌ frontend/tailwind.config.js missing")
     
     # Check CSS file with TailwindCSS directives
-    if os.path.exists('frontend/src/index.css'):
+    try:
+        content = Path('frontend/src/index.css').read_bytes()
+    except FileNotFoundError:
+        issues.append("❌ frontend/src/index.css missing")
+    except OSError:
+        issues.append("❌ Could not read index.css")
+    else:
         print("✅ frontend/src/index.css exists")
         
-        try:
-            with open('frontend/src/index.css', 'r') as f:
-                content = f.read()
-                required_directives = ['@tailwind base', '@tailwind components', '@tailwind utilities']
-                
-                for directive in required_directives:
-                    if directive in content:
-                        print(f"✅ Found: {directive}")
-                    else:
-                        issues.append(f"❌ Missing: {directive}")
-        except:
-            issues.append("❌ Could not read index.css")
-    else:
-        issues.append("❌ frontend/src/index.css missing")
+        found = {match.group(1).decode('ascii') for match in TAILWIND_DIRECTIVE_RE.finditer(content)}
+        
+        for directive in REQUIRED_DIRECTIVES:
+            if directive in found:
+                print(f"✅ Found: @tailwind {directive}")
+            else:
+                issues.append(f"❌ Missing: @tailwind {directive}")
     
     # Check package.json for TailwindCSS dependency
-    if os.path.exists('frontend/package.json'):
+    try:
+        raw = Path('frontend/package.json').read_bytes()
+    except FileNotFoundError:
+        issues.append("❌ frontend/package.json missing")
+    except OSError:
+        issues.append("❌ Could not read package.json")
+    else:
         print("✅ frontend/package.json exists")
         
         try:
-            with open('frontend/package.json', 'r') as f:
-                package_data = json.load(f)
-                dev_deps = package_data.get('devDependencies', {})
+            # Both parsers take bytes directly - no text-mode decode pass
+            package_data = orjson.loads(raw) if orjson is not None else json.loads(raw)
+            dev_deps = package_data.get('devDependencies', {})
+            
+            if 'tailwindcss' in dev_deps:
+                print(f"✅ TailwindCSS dependency: {dev_deps['tailwindcss']}")
+            else:
+                issues.append("❌ TailwindCSS not in devDependencies")
+                
+            if 'autoprefixer' in dev_deps:
+                print(f"✅ Autoprefixer dependency: {dev_deps['autoprefixer']}")
+            else:
+                issues.append("❌ Autoprefixer not in devDependencies")
                 
-                if 'tailwindcss' in dev_deps:
-                    print(f"✅ TailwindCSS dependency: {dev_deps['tailwindcss']}")
-                else:
-                    issues.append("❌ TailwindCSS not in devDependencies")
-                    
-                if 'autoprefixer' in dev_deps:
-                    print(f"✅ Autoprefixer dependency: {dev_deps['autoprefixer']}")
-                else:
-                    issues.append("❌ Autoprefixer not in devDependencies")
-                    
-                if 'postcss' in dev_deps:
-                    print(f"✅ PostCSS dependency: {dev_deps['postcss']}")
-                else:
-                    issues.append("❌ PostCSS not in devDependencies")
+            if 'postcss' in dev_deps:
+                print(f"✅ PostCSS dependency: {dev_deps['postcss']}")
+            else:
+                issues.append("❌ PostCSS not in devDependencies")
         except:
             issues.append("❌ Could not read package.json")
-    else:
-        issues.append("❌ frontend/package.json missing")
     
     # Check for conflicting root PostCSS config
     if os.path.exists('postcss.config.js'):
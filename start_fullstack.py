@@ -10,11 +10,19 @@ import subprocess
 import sys
 import time
 import requests
+import requests.adapters
 import os
+import queue
+import hashlib
+import select
+import shutil
 from pathlib import Path
 import signal
+import socket
+import struct
 import threading
 import webbrowser
+from concurrent.futures import ThreadPoolExecutor
 
 class Colors:
     """ANSI color codes for terminal output"""
@@ -27,12 +35,39 @@ class Colors:
     ENDC = '\033[0m'
     BOLD = '\033[1m'
 
+# Redirected output (log files, CI) gets plain text without escape codes
+if not sys.stdout.isatty():
+    for _name in ('HEADER', 'BLUE', 'CYAN', 'GREEN', 'YELLOW', 'RED', 'ENDC', 'BOLD'):
+        setattr(Colors, _name, '')
+
+# Status tags, coloured once at import instead of on every print
+_OK = f"{Colors.GREEN}✅{Colors.ENDC}"
+_FAIL = f"{Colors.RED}❌{Colors.ENDC}"
+_WARN = f"{Colors.YELLOW}⚠️{Colors.ENDC}"
+
+# Each service runs in its own process group so cleanup can signal its whole tree
+if os.name == 'nt':
+    PROCESS_GROUP_KWARGS = {'creationflags': subprocess.CREATE_NEW_PROCESS_GROUP}
+else:
+    PROCESS_GROUP_KWARGS = {'start_new_session': True}
+
+# Readiness polling backs off exponentially between these bounds (seconds)
+POLL_INITIAL_DELAY = 0.05
+POLL_MAX_DELAY = 1.5
+
 class FullStackLauncher:
     def __init__(self):
         self.backend_process = None
         self.frontend_process = None
         self.backend_port = 8000
         self.frontend_port = 5173
+        self.log_dir = Path('logs')
+        
+        # One keep-alive session for every probe, so polling reuses a
+        # connection per (host, port) instead of a fresh handshake each time
+        self._session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=0)
+        self._session.mount('http://', adapter)
         
     def print_banner(self):
         """Print startup banner"""
@@ -51,67 +86,85 @@ class FullStackLauncher:
         # Check Python
         python_version = sys.version_info
         if python_version.major < 3 or (python_version.major == 3 and python_version.minor < 8):
-            print(f"{Colors.RED}❌ Python 3.8+ required, found {python_version.major}.{python_version.minor}{Colors.ENDC}")
+            print(f"{_FAIL} Python 3.8+ required, found {python_version.major}.{python_version.minor}")
             return False
-        print(f"{Colors.GREEN}✅ Python {python_version.major}.{python_version.minor}.{python_version.micro}{Colors.ENDC}")
+        print(f"{_OK} Python {python_version.major}.{python_version.minor}.{python_version.micro}")
+        
+        # One listing of the project root instead of a stat() per path
+        entries = {entry.name: entry for entry in os.scandir('.')}
         
         # Check if backend directory exists
-        if not os.path.exists('backend'):
-            print(f"{Colors.RED}❌ Backend directory not found{Colors.ENDC}")
+        if 'backend' not in entries or not entries['backend'].is_dir():
+            print(f"{_FAIL} Backend directory not found")
             return False
-        print(f"{Colors.GREEN}✅ Backend directory found{Colors.ENDC}")
+        print(f"{_OK} Backend directory found")
         
         # Check if frontend directory exists
-        if not os.path.exists('frontend'):
-            print(f"{Colors.RED}❌ Frontend directory not found{Colors.ENDC}")
+        if 'frontend' not in entries or not entries['frontend'].is_dir():
+            print(f"{_FAIL} Frontend directory not found")
             return False
-        print(f"{Colors.GREEN}✅ Frontend directory found{Colors.ENDC}")
+        print(f"{_OK} Frontend directory found")
         
         # Check if package.json exists
-        if not os.path.exists('frontend/package.json'):
-            print(f"{Colors.RED}❌ Frontend package.json not found{Colors.ENDC}")
+        if not any(entry.name == 'package.json' for entry in os.scandir('frontend')):
+            print(f"{_FAIL} Frontend package.json not found")
             return False
-        print(f"{Colors.GREEN}✅ Frontend package.json found{Colors.ENDC}")
+        print(f"{_OK} Frontend package.json found")
         
-        # Check Node.js/npm
-        try:
-            result = subprocess.run(['npm', '--version'], capture_output=True, text=True)
-            if result.returncode == 0:
-                print(f"{Colors.GREEN}✅ npm {result.stdout.strip()}{Colors.ENDC}")
-            else:
-                print(f"{Colors.RED}❌ npm not found or not working{Colors.ENDC}")
-                return False
-        except FileNotFoundError:
-            print(f"{Colors.RED}❌ npm not found - please install Node.js{Colors.ENDC}")
+        # Check Node.js/npm - a PATH lookup first, so a missing npm costs no fork
+        npm_path = shutil.which('npm')
+        if npm_path is None:
+            print(f"{_FAIL} npm not found - please install Node.js")
+            return False
+        result = subprocess.run([npm_path, '--version'], capture_output=True, text=True)
+        if result.returncode == 0:
+            print(f"{_OK} npm {result.stdout.strip()}")
+        else:
+            print(f"{_FAIL} npm not found or not working")
             return False
         
-        print(f"{Colors.GREEN}✅ All requirements met{Colors.ENDC}\n")
+        print(f"{_OK} All requirements met\n")
         return True
 
+    def _port_open(self, port):
+        """True when something accepts TCP connections on the local port"""
+        probe = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        # Reset-close the throwaway probe so repeated polls do not pile up
+        # sockets in TIME_WAIT and exhaust ephemeral ports
+        probe.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, struct.pack('ii', 1, 0))
+        probe.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        probe.settimeout(0.2)
+        try:
+            return probe.connect_ex(("127.0.0.1", port)) == 0
+        finally:
+            probe.close()
+
     def check_port_available(self, port):
         """Check if a port is available"""
-        try:
-            response = requests.get(f'http://localhost:{port}', timeout=2)
-            return False  # Port is occupied
-        except (requests.ConnectionError, requests.Timeout):
-            return True  # Port is available
+        return not self._port_open(port)
 
     def wait_for_backend(self, timeout=60):
         """Wait for backend to be ready"""
         print(f"{Colors.YELLOW}⏳ Waiting for backend to start...{Colors.ENDC}")
         
         start_time = time.time()
+        delay = POLL_INITIAL_DELAY
         while time.time() - start_time < timeout:
-            try:
-                response = requests.get(f'http://localhost:{self.backend_port}/health', timeout=2)
-                if response.status_code == 200:
-                    print(f"{Colors.GREEN}✅ Backend is ready!{Colors.ENDC}")
-                    return True
-            except (requests.ConnectionError, requests.Timeout):
-                time.sleep(2)
-                print(".", end="", flush=True)
-        
-        print(f"\n{Colors.RED}❌ Backend failed to start within {timeout} seconds{Colors.ENDC}")
+            # Plain TCP connect until the server binds; one HTTP check after that
+            if self._port_open(self.backend_port):
+                try:
+                    response = self._session.get(f'http://localhost:{self.backend_port}/health', timeout=0.5)
+                    if response.status_code == 200:
+                        print(f"{_OK} Backend is ready!")
+                        return True
+                except (requests.ConnectionError, requests.Timeout):
+                    pass
+            # Back off 50 ms -> 1.5 s: quick starts are caught at once, slow ones polled gently
+            time.sleep(delay)
+            delay = min(POLL_MAX_DELAY, delay * 2)
+            print(".", end="", flush=True)
+        
+        print(f"\n{_FAIL} Backend failed to start within {timeout} seconds")
         return False
 
     def wait_for_frontend(self, timeout=30):
@@ -119,75 +172,114 @@ class FullStackLauncher:
         print(f"{Colors.YELLOW}⏳ Waiting for frontend to start...{Colors.ENDC}")
         
         start_time = time.time()
+        delay = POLL_INITIAL_DELAY
         while time.time() - start_time < timeout:
-            try:
-                response = requests.get(f'http://localhost:{self.frontend_port}', timeout=2)
-                if response.status_code == 200:
-                    print(f"{Colors.GREEN}✅ Frontend is ready!{Colors.ENDC}")
-                    return True
-            except (requests.ConnectionError, requests.Timeout):
-                time.sleep(1)
-                print(".", end="", flush=True)
-        
-        print(f"\n{Colors.RED}❌ Frontend failed to start within {timeout} seconds{Colors.ENDC}")
+            # Plain TCP connect until the dev server binds; one HTTP check after that
+            if self._port_open(self.frontend_port):
+                try:
+                    response = self._session.get(f'http://localhost:{self.frontend_port}', timeout=0.5)
+                    if response.status_code == 200:
+                        print(f"{_OK} Frontend is ready!")
+                        return True
+                except (requests.ConnectionError, requests.Timeout):
+                    pass
+            # Back off 50 ms -> 1.5 s: quick starts are caught at once, slow ones polled gently
+            time.sleep(delay)
+            delay = min(POLL_MAX_DELAY, delay * 2)
+            print(".", end="", flush=True)
+        
+        print(f"\n{_FAIL} Frontend failed to start within {timeout} seconds")
         return False
 
+    def _open_log(self, name):
+        """Open an unbuffered binary append log for a child process's output"""
+        self.log_dir.mkdir(exist_ok=True)
+        return open(self.log_dir / f'{name}.log', 'ab', buffering=0)
+
     def start_backend(self):
         """Start the FastAPI backend"""
         print(f"{Colors.BLUE}🚀 Starting backend (FastAPI + LangChain)...{Colors.ENDC}")
         
         try:
-            # Change to backend directory and start
-            self.backend_process = subprocess.Popen(
-                [sys.executable, 'main.py'],
-                cwd='backend',
-                stdout=subprocess.PIPE,
-                stderr=subprocess.STDOUT,
-                text=True,
-                bufsize=1,
-                universal_newlines=True
-            )
+            # Change to backend directory and start; output goes straight to a
+            # log file (a pipe nobody reads would stall the server once full)
+            with self._open_log('backend') as log_file:
+                self.backend_process = subprocess.Popen(
+                    [sys.executable, 'main.py'],
+                    cwd='backend',
+                    stdout=log_file,
+                    stderr=subprocess.STDOUT,
+                    **PROCESS_GROUP_KWARGS
+                )
             
-            print(f"{Colors.GREEN}✅ Backend process started (PID: {self.backend_process.pid}){Colors.ENDC}")
+            print(f"{_OK} Backend process started (PID: {self.backend_process.pid})")
+            print(f"{Colors.CYAN}   Logs:{Colors.ENDC} {self.log_dir / 'backend.log'}")
             return True
             
         except Exception as e:
-            print(f"{Colors.RED}❌ Failed to start backend: {e}{Colors.ENDC}")
+            print(f"{_FAIL} Failed to start backend: {e}")
             return False
 
+    def _npm_install_stamp(self):
+        """Hash of the frontend lockfile (package.json if there is none)"""
+        frontend_dir = Path('frontend')
+        lock_file = frontend_dir / 'package-lock.json'
+        if not lock_file.exists():
+            lock_file = frontend_dir / 'package.json'
+        return hashlib.sha256(lock_file.read_bytes()).hexdigest()
+
     def start_frontend(self):
         """Start the Vite frontend"""
         print(f"{Colors.BLUE}🚀 Starting frontend (React + Vite)...{Colors.ENDC}")
         
         try:
-            # Install dependencies first
-            print(f"{Colors.YELLOW}📦 Installing frontend dependencies...{Colors.ENDC}")
-            install_result = subprocess.run(
-                ['npm', 'install'],
-                cwd='frontend',
-                capture_output=True,
-                text=True
-            )
+            # Install dependencies first, unless node_modules was installed
+            # from this exact lockfile (the stamp lives inside node_modules,
+            # so deleting it forces a fresh install)
+            stamp_file = Path('frontend') / 'node_modules' / '.npm_install_stamp'
+            lock_hash = self._npm_install_stamp()
+            try:
+                up_to_date = stamp_file.read_text(encoding='utf-8') == lock_hash
+            except OSError:
+                up_to_date = False
             
-            if install_result.returncode != 0:
-                print(f"{Colors.YELLOW}⚠️ npm install had issues, continuing anyway...{Colors.ENDC}")
+            if up_to_date:
+                print(f"{_OK} Frontend dependencies up to date")
+            else:
+                print(f"{Colors.YELLOW}📦 Installing frontend dependencies...{Colors.ENDC}")
+                install_result = subprocess.run(
+                    ['npm', 'install'],
+                    cwd='frontend',
+                    capture_output=True,
+                    text=True
+                )
+                
+                if install_result.returncode != 0:
+                    print(f"{_WARN} npm install had issues, continuing anyway...")
+                else:
+                    # npm install may rewrite the lockfile, so hash it again; a
+                    # stamp that cannot be written only means reinstalling next time
+                    try:
+                        stamp_file.write_text(self._npm_install_stamp(), encoding='utf-8')
+                    except OSError as e:
+                        print(f"{_WARN} Could not record install stamp: {e}")
             
             # Start frontend
-            self.frontend_process = subprocess.Popen(
-                ['npm', 'run', 'dev'],
-                cwd='frontend',
-                stdout=subprocess.PIPE,
-                stderr=subprocess.STDOUT,
-                text=True,
-                bufsize=1,
-                universal_newlines=True
-            )
+            with self._open_log('frontend') as log_file:
+                self.frontend_process = subprocess.Popen(
+                    ['npm', 'run', 'dev'],
+                    cwd='frontend',
+                    stdout=log_file,
+                    stderr=subprocess.STDOUT,
+                    **PROCESS_GROUP_KWARGS
+                )
             
-            print(f"{Colors.GREEN}✅ Frontend process started (PID: {self.frontend_process.pid}){Colors.ENDC}")
+            print(f"{_OK} Frontend process started (PID: {self.frontend_process.pid})")
+            print(f"{Colors.CYAN}   Logs:{Colors.ENDC} {self.log_dir / 'frontend.log'}")
             return True
             
         except Exception as e:
-            print(f"{Colors.RED}❌ Failed to start frontend: {e}{Colors.ENDC}")
+            print(f"{_FAIL} Failed to start frontend: {e}")
             return False
 
     def test_integration(self):
@@ -200,23 +292,32 @@ class FullStackLauncher:
             ("Frontend", f"http://localhost:{self.frontend_port}"),
         ]
         
-        all_passed = True
-        for test_name, url in tests:
+        def probe(test):
+            test_name, url = test
             try:
-                response = requests.get(url, timeout=5)
-                if response.status_code == 200:
-                    print(f"{Colors.GREEN}✅ {test_name}: OK{Colors.ENDC}")
-                else:
-                    print(f"{Colors.RED}❌ {test_name}: HTTP {response.status_code}{Colors.ENDC}")
-                    all_passed = False
+                return test_name, self._session.get(url, timeout=5), None
             except Exception as e:
-                print(f"{Colors.RED}❌ {test_name}: {str(e)}{Colors.ENDC}")
+                return test_name, None, e
+        
+        # Probes are network-bound; run them together and report in order
+        with ThreadPoolExecutor(max_workers=len(tests)) as executor:
+            outcomes = list(executor.map(probe, tests))
+        
+        all_passed = True
+        for test_name, response, error in outcomes:
+            if error is not None:
+                print(f"{_FAIL} {test_name}: {str(error)}")
+                all_passed = False
+            elif response.status_code == 200:
+                print(f"{_OK} {test_name}: OK")
+            else:
+                print(f"{_FAIL} {test_name}: HTTP {response.status_code}")
                 all_passed = False
         
         if all_passed:
             print(f"\n{Colors.GREEN}🎉 All integration tests passed!{Colors.ENDC}")
         else:
-            print(f"\n{Colors.YELLOW}⚠️ Some tests failed, but services may still work{Colors.ENDC}")
+            print(f"\n{_WARN} Some tests failed, but services may still work")
         
         return all_passed
 
@@ -237,28 +338,85 @@ class FullStackLauncher:
         print(f"{Colors.HEADER}{'='*60}{Colors.ENDC}")
         print(f"{Colors.YELLOW}Press Ctrl+C to stop both services{Colors.ENDC}\n")
 
+    def _signal_group(self, process, force=False):
+        """Signal a service's whole process group (npm also forks the Vite server)"""
+        if os.name == 'nt':
+            process.kill() if force else process.terminate()
+            return
+        try:
+            os.killpg(process.pid, signal.SIGKILL if force else signal.SIGTERM)
+        except ProcessLookupError:
+            pass  # already gone
+
+    def _stop_process(self, process):
+        """Terminate a service, killing it if it has not exited after 5 seconds"""
+        self._signal_group(process)
+        try:
+            process.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            self._signal_group(process, force=True)
+            process.wait()
+
     def cleanup(self, signal_num=None, frame=None):
         """Clean up processes"""
         print(f"\n{Colors.YELLOW}🛑 Shutting down services...{Colors.ENDC}")
         
-        if self.backend_process:
-            print(f"{Colors.BLUE}🔌 Stopping backend...{Colors.ENDC}")
-            self.backend_process.terminate()
-            try:
-                self.backend_process.wait(timeout=5)
-            except subprocess.TimeoutExpired:
-                self.backend_process.kill()
+        # Stop both services at once; worst case is one 5 s grace period, not two
+        stoppers = []
+        for name, process in (("backend", self.backend_process), ("frontend", self.frontend_process)):
+            if process:
+                print(f"{Colors.BLUE}🔌 Stopping {name}...{Colors.ENDC}")
+                stopper = threading.Thread(target=self._stop_process, args=(process,))
+                stopper.start()
+                stoppers.append(stopper)
+        for stopper in stoppers:
+            stopper.join()
         
-        if self.frontend_process:
-            print(f"{Colors.BLUE}🔌 Stopping frontend...{Colors.ENDC}")
-            self.frontend_process.terminate()
+        print(f"{_OK} All services stopped")
+        sys.exit(0)
+
+    def _open_browser(self):
+        """Open the frontend in the default browser, ignoring failures"""
+        try:
+            webbrowser.open(f'http://localhost:{self.frontend_port}')
+        except:
+            pass
+
+    def _wait_for_exit(self):
+        """Block until either service process exits and return that process"""
+        processes = [proc for proc in (self.backend_process, self.frontend_process) if proc]
+        
+        # Linux: a pidfd becomes readable when its process exits, so one
+        # select() sleeps until something actually dies
+        if hasattr(os, 'pidfd_open'):
+            pidfds = {}
             try:
-                self.frontend_process.wait(timeout=5)
-            except subprocess.TimeoutExpired:
-                self.frontend_process.kill()
+                for proc in processes:
+                    pidfds[os.pidfd_open(proc.pid)] = proc
+                ready, _, _ = select.select(list(pidfds), [], [])
+                return pidfds[ready[0]]
+            except OSError:
+                pass  # no pidfd support, or a process is already gone
+            finally:
+                for fd in pidfds:
+                    os.close(fd)
         
-        print(f"{Colors.GREEN}✅ All services stopped{Colors.ENDC}")
-        sys.exit(0)
+        # Elsewhere: one waiter thread per process reports the first exit
+        exited = queue.Queue()
+        
+        def watch(proc):
+            proc.wait()
+            exited.put(proc)
+        
+        for proc in processes:
+            threading.Thread(target=watch, args=(proc,), daemon=True).start()
+        # Wake up every second: on Windows a blocking get() cannot be
+        # interrupted by Ctrl+C
+        while True:
+            try:
+                return exited.get(timeout=1)
+            except queue.Empty:
+                pass
 
     def run(self):
         """Main run method"""
@@ -297,24 +455,16 @@ class FullStackLauncher:
         # Print status
         self.print_status()
         
-        # Open browser
-        try:
-            webbrowser.open(f'http://localhost:{self.frontend_port}')
-        except:
-            pass
+        # Open browser in the background; spawning it can take a second or two
+        # and should not hold up supervising the services
+        threading.Thread(target=self._open_browser, daemon=True).start()
         
-        # Keep running until interrupted
+        # Keep running until interrupted or a service exits
         try:
-            while True:
-                if self.backend_process and self.backend_process.poll() is not None:
-                    print(f"{Colors.RED}❌ Backend process died{Colors.ENDC}")
-                    break
-                
-                if self.frontend_process and self.frontend_process.poll() is not None:
-                    print(f"{Colors.RED}❌ Frontend process died{Colors.ENDC}")
-                    break
-                
-                time.sleep(1)
+            if self._wait_for_exit() is self.backend_process:
+                print(f"{_FAIL} Backend process died")
+            else:
+                print(f"{_FAIL} Frontend process died")
         except KeyboardInterrupt:
             pass
         
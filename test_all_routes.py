@@ -7,72 +7,137 @@ Tests all FastAPI routes after route registration fixes
 import requests
 import json
 import time
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from pathlib import Path
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
 
 # Configuration
 BACKEND_URL = "http://localhost:8000"
 FRONTEND_URL = "http://localhost:5173"
 
-def test_endpoint(method, endpoint, data=None, files=None, expected_status=200):
-    """Test a single endpoint and return results"""
-    url = f"{BACKEND_URL}{endpoint}"
+# Shared keep-alive session; every probe reuses its pooled connections
+SESSION = requests.Session()
+
+# Probes run concurrently, capped so the Vite dev server is not swamped
+MAX_WORKERS = 8
+PROXY_ENDPOINTS = {"/status", "/startup-check", "/chat", "/reminders/all"}
+
+# Endpoints whose body is a JSON model rather than form fields (/chat takes Form data)
+JSON_ENDPOINTS = {"/reminders/", "/confirm/"}
+
+# Bodies this large are only excerpted in results, never decoded whole
+MAX_JSON_BYTES = 1_000_000
+
+def build_request(method, endpoint, data=None, files=None):
+    """Resolve a probe into (METHOD, endpoint, request kwargs) once, ahead of sending"""
+    method = method.upper()
+    if method == "GET":
+        kwargs = {"timeout": 10}
+    elif files:
+        kwargs = {"data": data, "files": files, "timeout": 30}
+    elif not data:
+        kwargs = {"timeout": 30}
+    elif endpoint in JSON_ENDPOINTS or not isinstance(data, dict):
+        kwargs = {"json": data, "timeout": 30}
+    else:
+        kwargs = {"data": data, "timeout": 30}
+    return method, endpoint, kwargs
+
+def send_request(method, endpoint, kwargs, expected_status=200):
+    """Send a prebuilt probe to the backend and return results"""
+    if method not in ("GET", "POST"):
+        return {"status": "SKIP", "reason": f"Method {method} not implemented"}
     
+    url = f"{BACKEND_URL}{endpoint}"
     try:
-        if method.upper() == "GET":
-            response = requests.get(url, timeout=10)
-        elif method.upper() == "POST":
-            if files:
-                response = requests.post(url, data=data, files=files, timeout=30)
-            elif data:
-                if isinstance(data, dict):
-                    # For form data
-                    response = requests.post(url, data=data, timeout=30)
-                else:
-                    # For JSON data
-                    response = requests.post(url, json=data, timeout=30)
-            else:
-                response = requests.post(url, timeout=30)
-        else:
-            return {"status": "SKIP", "reason": f"Method {method} not implemented"}
-
-        if response.status_code == expected_status:
-            try:
-                response_data = response.json()
-                return {
-                    "status": "✅ PASS",
-                    "response_time": f"{response.elapsed.total_seconds():.3f}s",
-                    "data": response_data
-                }
-            except:
-                return {
-                    "status": "✅ PASS",
-                    "response_time": f"{response.elapsed.total_seconds():.3f}s",
-                    "data": response.text[:200]
-                }
-        else:
+        response = SESSION.request(method, url, **kwargs)
+        
+        return _summarize_response(response, expected_status)
+    except requests.exceptions.RequestException as e:
+        return {
+            "status": "❌ FAIL",
+            "error": str(e)
+        }
+
+def test_endpoint(method, endpoint, data=None, files=None, expected_status=200):
+    """Test a single endpoint and return results"""
+    return send_request(*build_request(method, endpoint, data, files), expected_status)
+
+def _snippet(response, limit):
+    """First `limit` bytes of the body as text, without decoding the rest"""
+    return response.content[:limit].decode("utf-8", errors="replace")
+
+def _summarize_response(response, expected_status):
+    """Turn a requests or httpx response into a test result"""
+    if response.status_code == expected_status:
+        try:
+            if len(response.content) >= MAX_JSON_BYTES:
+                raise ValueError("response too large to decode")
+            response_data = response.json()
             return {
-                "status": "❌ FAIL",
-                "error": f"HTTP {response.status_code}",
-                "response": response.text[:300]
+                "status": "✅ PASS",
+                "response_time": f"{response.elapsed.total_seconds():.3f}s",
+                "data": response_data
             }
-    except requests.exceptions.RequestException as e:
+        except:
+            return {
+                "status": "✅ PASS",
+                "response_time": f"{response.elapsed.total_seconds():.3f}s",
+                "data": _snippet(response, 200)
+            }
+    else:
+        return {
+            "status": "❌ FAIL",
+            "error": f"HTTP {response.status_code}",
+            "response": _snippet(response, 300)
+        }
+
+async def atest_endpoint(client, method, endpoint, kwargs, expected_status=200):
+    """Async variant of send_request on a shared httpx.AsyncClient"""
+    if method not in ("GET", "POST"):
+        return {"status": "SKIP", "reason": f"Method {method} not implemented"}
+    
+    try:
+        response = await client.request(method, endpoint, **kwargs)
+        return _summarize_response(response, expected_status)
+    except httpx.HTTPError as e:
         return {
             "status": "❌ FAIL",
             "error": str(e)
         }
 
+async def _run_backend_probes(probes):
+    """Run prebuilt (method, endpoint, kwargs) probes on one event loop and connection pool"""
+    limits = httpx.Limits(max_keepalive_connections=MAX_WORKERS)
+    async with httpx.AsyncClient(base_url=BACKEND_URL, limits=limits) as client:
+        return await asyncio.gather(*[atest_endpoint(client, *probe) for probe in probes])
+
 def test_frontend_proxy(endpoint, method="GET", data=None):
     """Test endpoint through frontend proxy"""
     url = f"{FRONTEND_URL}/api{endpoint}"
     
     try:
         if method.upper() == "GET":
-            response = requests.get(url, timeout=10)
+            # Only routing matters here, so skip the body. FastAPI answers HEAD on
+            # GET routes with 405, which still proves the proxy reached the backend
+            # (a broken proxy answers 5xx), so there is no need to retry with GET.
+            response = SESSION.head(url, timeout=3, allow_redirects=False)
         elif method.upper() == "POST":
             if isinstance(data, dict):
-                response = requests.post(url, data=data, timeout=30)
+                response = SESSION.post(url, data=data, timeout=30)
             else:
-                response = requests.post(url, json=data, timeout=30)
+                response = SESSION.post(url, json=data, timeout=30)
         
         return {
             "status": "✅ PROXY OK" if response.status_code < 500 else "❌ PROXY FAIL",
@@ -91,7 +156,7 @@ def run_comprehensive_route_test():
     print("=" * 70)
     print(f"Backend: {BACKEND_URL}")
     print(f"Frontend: {FRONTEND_URL}")
-    print(f"Started: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+    print(f"Started: {time.strftime('%Y-%m-%d %H:%M:%S')}")
     print("=" * 70)
 
     # First test the new startup-check endpoint
@@ -150,29 +215,45 @@ def run_comprehensive_route_test():
     passed_tests = 0
     failed_tests = 0
 
-    for i, test_data in enumerate(tests, 1):
-        method, endpoint, description = test_data[:3]
-        data = test_data[3] if len(test_data) > 3 else None
-        files = test_data[4] if len(test_data) > 4 else None
-        
-        print(f"\n[{i:2d}/{total_tests}] Testing {description}")
-        print(f"         {method} {endpoint}")
-        
-        # Test direct backend
-        result = test_endpoint(method, endpoint, data, files)
-        results[endpoint] = result
+    normalized = [
+        (test_data[0], test_data[1], test_data[2],
+         test_data[3] if len(test_data) > 3 else None,
+         test_data[4] if len(test_data) > 4 else None)
+        for test_data in tests
+    ]
+    
+    # Test direct backend - every probe in flight at once
+    probes = [build_request(method, endpoint, data, files) for method, endpoint, _, data, files in normalized]
+    if httpx is not None:
+        backend_results = asyncio.run(_run_backend_probes(probes))
+    else:
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+            backend_results = list(executor.map(lambda probe: send_request(*probe), probes))
+    
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        # Test through frontend proxy where the backend works
+        proxy_futures = {}
+        for (method, endpoint, _, data, _), result in zip(normalized, backend_results):
+            if endpoint in PROXY_ENDPOINTS and result["status"].startswith("✅"):
+                proxy_futures[endpoint] = executor.submit(test_frontend_proxy, endpoint, method, data)
         
-        if result["status"].startswith("✅"):
-            passed_tests += 1
-            print(f"         {result['status']} ({result.get('response_time', 'N/A')})")
+        # Report in submission order so the log stays deterministic
+        for i, ((method, endpoint, description, _, _), result) in enumerate(zip(normalized, backend_results), 1):
+            results[endpoint] = result
             
-            # Test through frontend proxy if backend works
-            if endpoint in ["/status", "/startup-check", "/chat", "/reminders/all"]:
-                proxy_result = test_frontend_proxy(endpoint, method, data)
-                print(f"         Proxy: {proxy_result['status']} ({proxy_result.get('response_time', 'N/A')})")
-        else:
-            failed_tests += 1
-            print(f"         {result['status']} - {result.get('error', 'Unknown error')}")
+            print(f"\n[{i:2d}/{total_tests}] Testing {description}")
+            print(f"         {method} {endpoint}")
+            
+            if result["status"].startswith("✅"):
+                passed_tests += 1
+                print(f"         {result['status']} ({result.get('response_time', 'N/A')})")
+                
+                if endpoint in proxy_futures:
+                    proxy_result = proxy_futures[endpoint].result()
+                    print(f"         Proxy: {proxy_result['status']} ({proxy_result.get('response_time', 'N/A')})")
+            else:
+                failed_tests += 1
+                print(f"         {result['status']} - {result.get('error', 'Unknown error')}")
 
     # Test docs endpoint
     print(f"\n[{total_tests + 1}] Testing API Documentation")
@@ -224,27 +305,34 @@ def quick_frontend_test():
         ("/reminders/all", "GET")
     ]
     
-    for endpoint, method in proxy_tests:
-        result = test_frontend_proxy(endpoint, method)
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        proxy_results = list(executor.map(lambda test: test_frontend_proxy(*test), proxy_tests))
+    
+    for (endpoint, method), result in zip(proxy_tests, proxy_results):
         print(f"  {method} /api{endpoint}: {result['status']}")
 
 if __name__ == "__main__":
     try:
+        started_at = datetime.now().isoformat()
         passed, failed, results = run_comprehensive_route_test()
         
         # Quick frontend proxy test
         quick_frontend_test()
         
-        # Save results to file
-        with open("route_test_results.json", "w") as f:
-            json.dump({
-                "timestamp": datetime.now().isoformat(),
-                "passed": passed,
-                "failed": failed,
-                "results": results,
-                "backend_url": BACKEND_URL,
-                "frontend_url": FRONTEND_URL
-            }, f, indent=2)
+        # Save results to file; the timestamp is the run's start
+        payload = {
+            "timestamp": started_at,
+            "passed": passed,
+            "failed": failed,
+            "results": results,
+            "backend_url": BACKEND_URL,
+            "frontend_url": FRONTEND_URL
+        }
+        if orjson is not None:
+            Path("route_test_results.json").write_bytes(orjson.dumps(payload, option=orjson.OPT_INDENT_2))
+        else:
+            with open("route_test_results.json", "w") as f:
+                json.dump(payload, f, indent=2)
             
         print(f"\n📁 Results saved to: route_test_results.json")
         
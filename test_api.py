@@ -1,6 +1,9 @@
 import requests
 import json
 
+# Shared keep-alive session so the checks reuse one connection
+SESSION = requests.Session()
+
 def test_api():
     """Test the PDF Reminder Extraction API"""
     base_url = "http://127.0.0.1:8001"
@@ -9,7 +12,7 @@ def test_api():
     
     # Test 1: Health check
     try:
-        response = requests.get(f"{base_url}/health")
+        response = SESSION.get(f"{base_url}/health")
         print(f"✅ Health Check: {response.status_code}")
         print(f"   Response: {response.json()}")
     except Exception as e:
@@ -18,7 +21,7 @@ def test_api():
     
     # Test 2: Root endpoint
     try:
-        response = requests.get(f"{base_url}/")
+        response = SESSION.get(f"{base_url}/")
         print(f"✅ Root Endpoint: {response.status_code}")
         print(f"   Response: {response.json()}")
     except Exception as e:
@@ -34,7 +37,7 @@ def test_api():
             "user_id": "test_user"
         }
         
-        response = requests.post(f"{base_url}/confirm-reminders", json=data)
+        response = SESSION.post(f"{base_url}/confirm-reminders", json=data)
         print(f"✅ Confirm Reminders: {response.status_code}")
         print(f"   Response: {response.json()}")
     except Exception as e:
@@ -42,7 +45,7 @@ def test_api():
     
     # Test 4: Get reminders
     try:
-        response = requests.get(f"{base_url}/reminders/test_user")
+        response = SESSION.get(f"{base_url}/reminders/test_user")
         print(f"✅ Get Reminders: {response.status_code}")
         print(f"   Response: {response.json()}")
     except Exception as e:
@@ -4,27 +4,121 @@ Comprehensive QA Test Suite for LangChain-powered FastAPI Backend
 Tests all critical functionality across file upload, embedding, chat orchestration, and dynamic LLM handling
 """
 
-import requests
+import httpx
 import json
 import time
 import os
+import sys
+import asyncio
+import importlib.util
+from enum import IntEnum
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Configuration
 BASE_URL = "http://localhost:8000"
 TEST_FILES_DIR = Path("test_files")
 
+# Multiplex concurrent probes over one HTTP/2 connection when the h2 package is
+# installed; httpx negotiates it over TLS, so plain-http uvicorn stays on HTTP/1.1
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+# Readiness probe: attempts, first retry delay and delay cap (seconds, doubling)
+READY_ATTEMPTS = 10
+READY_BACKOFF = 0.3
+READY_MAX_DELAY = 2.0
+
+# Upload fixtures, encoded once; tests send these bytes straight from memory
+FIXTURES = {
+    # Text file with reminder content
+    "test.txt": """Test Document for Backend QA
+
+This is a sample text file for testing.
+
+Important Information:
+- Omar visa renewal: 2027-11-20
+- Project deadline: 2024-02-15
+- Meeting scheduled: 2024-01-30 at 2:00 PM
+
+Content for analysis and embedding testing.""".encode("utf-8"),
+    "test.csv": """Name,Date,Task,Priority,Status
+Omar,2027-11-20,Visa renewal,High,Pending
+Sarah,2024-02-15,Project deadline,Critical,Active
+Mike,2024-01-30,Team meeting,Medium,Scheduled""".encode("utf-8"),
+    "reminder_doc.txt": "Important: Omar visa renewal due on 2027-11-20. Please prepare documents.".encode("utf-8"),
+}
+
+# Tests that must pass for the backend to count as production ready
+CRITICAL_TESTS = frozenset({
+    "Root Endpoint", "Health Check", "Upload test.txt", "Upload test.csv",
+    "Chat: Hello, how are you?...", "Embedding Stats"
+})
+
+class Status(IntEnum):
+    """Test outcome; the emoji label is only looked up when printing or saving"""
+    FAIL = 0
+    PASS = 1
+
+STATUS_LABELS = {
+    Status.FAIL: "❌ FAIL",
+    Status.PASS: "✅ PASS",
+}
+
+def _labelled(results):
+    """Results with readable status labels, for the saved JSON"""
+    return {name: {**result, "status": STATUS_LABELS[result["status"]]} for name, result in results.items()}
+
+def _json(response):
+    """Decode a JSON response body straight from its bytes, with orjson when available"""
+    if orjson is not None:
+        return orjson.loads(response.content)
+    return response.json()
+
+def _save_json(path, payload):
+    """Write results as indented JSON via a temp file and rename, so a crash never leaves a partial file"""
+    if orjson is not None:
+        data = orjson.dumps(payload, option=orjson.OPT_INDENT_2)
+    else:
+        data = json.dumps(payload, indent=2).encode("utf-8")
+    tmp = Path(f"{path}.tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+# [second, formatted timestamp] of the last log_test call
+_TS_CACHE = [0, ""]
+
+def _now():
+    """Current local time as text, formatted at most once per second"""
+    t = int(time.time())
+    cache = _TS_CACHE
+    if cache[0] != t:
+        cache[0] = t
+        cache[1] = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(t))
+    return cache[1]
+
 class BackendQATester:
     def __init__(self):
         self.test_results = {}
-        self.session = requests.Session()
-        self.session.headers.update({"Accept": "application/json"})
+        # One keep-alive pool shared by every probe, including concurrent ones;
+        # the transport retries refused/reset connections before a test fails
+        self.client = httpx.AsyncClient(
+            base_url=BASE_URL,
+            headers={"Accept": "application/json"},
+            limits=httpx.Limits(max_connections=32, max_keepalive_connections=16),
+            http2=HTTP2_AVAILABLE,
+            transport=httpx.AsyncHTTPTransport(retries=2),
+        )
+        self.write_test_files()
         
     def log_test(self, test_name, status, details=None, error=None):
         """Log test results"""
         result = {
             "status": status,
-            "timestamp": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "timestamp": _now(),
         }
         if details:
             result["details"] = details
@@ -32,79 +126,81 @@ class BackendQATester:
             result["error"] = str(error)
         
         self.test_results[test_name] = result
-        print(f"[{status}] {test_name}")
+        print(f"[{STATUS_LABELS[status]}] {test_name}")
         if error:
             print(f"    Error: {error}")
         if details:
             print(f"    Details: {details}")
     
-    def test_health_check(self):
+    async def wait_for_backend(self):
+        """Poll /health with exponential backoff until the backend answers"""
+        delay = READY_BACKOFF
+        for _ in range(READY_ATTEMPTS):
+            try:
+                response = await self.client.get("/health", timeout=2)
+                if response.status_code not in (502, 503, 504):
+                    return True
+            except httpx.TransportError:
+                pass
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, READY_MAX_DELAY)
+        return False
+    
+    async def test_health_check(self):
         """Test 1: Health check endpoint"""
         try:
-            response = self.session.get(f"{BASE_URL}/health", timeout=10)
+            response = await self.client.get("/health", timeout=10)
             if response.status_code == 200:
-                data = response.json()
-                self.log_test("Health Check", "✅ PASS", {
+                data = _json(response)
+                self.log_test("Health Check", Status.PASS, {
                     "status": data.get("status"),
                     "services": data.get("services"),
                     "endpoints": data.get("endpoints")
                 })
                 return True
             else:
-                self.log_test("Health Check", "❌ FAIL", error=f"Status code: {response.status_code}")
+                self.log_test("Health Check", Status.FAIL, error=f"Status code: {response.status_code}")
                 return False
         except Exception as e:
-            self.log_test("Health Check", "❌ FAIL", error=e)
+            self.log_test("Health Check", Status.FAIL, error=e)
             return False
     
-    def test_root_endpoint(self):
+    async def test_root_endpoint(self):
         """Test basic connectivity"""
         try:
-            response = self.session.get(f"{BASE_URL}/", timeout=10)
+            response = await self.client.get("/", timeout=10)
             if response.status_code == 200:
-                data = response.json()
-                self.log_test("Root Endpoint", "✅ PASS", {
+                data = _json(response)
+                self.log_test("Root Endpoint", Status.PASS, {
                     "message": data.get("message"),
                     "version": data.get("version"),
                     "endpoints": len(data.get("endpoints", {}))
                 })
                 return True
             else:
-                self.log_test("Root Endpoint", "❌ FAIL", error=f"Status code: {response.status_code}")
+                self.log_test("Root Endpoint", Status.FAIL, error=f"Status code: {response.status_code}")
                 return False
         except Exception as e:
-            self.log_test("Root Endpoint", "❌ FAIL", error=e)
+            self.log_test("Root Endpoint", Status.FAIL, error=e)
             return False
     
-    def create_test_file(self, filename, content):
-        """Create a test file for uploading"""
+    def write_test_files(self):
+        """Write the upload fixtures to disk once, for manual re-use of the same files"""
         TEST_FILES_DIR.mkdir(exist_ok=True)
-        file_path = TEST_FILES_DIR / filename
-        
-        if filename.endswith('.txt'):
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(content)
-        elif filename.endswith('.csv'):
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(content)
-        
-        return file_path
+        for filename, content in FIXTURES.items():
+            (TEST_FILES_DIR / filename).write_bytes(content)
     
-    def test_file_upload(self, filename, content, expected_type):
+    async def test_file_upload(self, filename, expected_type):
         """Test file upload functionality"""
         try:
-            # Create test file
-            file_path = self.create_test_file(filename, content)
-            
-            # Upload file
-            with open(file_path, 'rb') as f:
-                files = {'file': (filename, f, 'application/octet-stream')}
-                data = {'intent': 'auto'}
-                response = self.session.post(f"{BASE_URL}/upload/", files=files, data=data, timeout=30)
+            # Upload the cached fixture bytes
+            files = {'file': (filename, FIXTURES[filename], 'application/octet-stream')}
+            data = {'intent': 'auto'}
+            response = await self.client.post("/upload/", files=files, data=data, timeout=30)
             
             if response.status_code == 200:
-                result = response.json()
-                self.log_test(f"Upload {filename}", "✅ PASS", {
+                result = _json(response)
+                self.log_test(f"Upload {filename}", Status.PASS, {
                     "filename": result.get("filename"),
                     "file_type": result.get("file_type"),
                     "summary": result.get("summary", "")[:100] + "..." if len(result.get("summary", "")) > 100 else result.get("summary", ""),
@@ -112,20 +208,20 @@ class BackendQATester:
                 })
                 return result
             else:
-                self.log_test(f"Upload {filename}", "❌ FAIL", error=f"Status code: {response.status_code}, Response: {response.text}")
+                self.log_test(f"Upload {filename}", Status.FAIL, error=f"Status code: {response.status_code}, Response: {response.text}")
                 return None
                 
         except Exception as e:
-            self.log_test(f"Upload {filename}", "❌ FAIL", error=e)
+            self.log_test(f"Upload {filename}", Status.FAIL, error=e)
             return None
     
-    def test_embedding_stats(self):
+    async def test_embedding_stats(self):
         """Test embedding statistics endpoint"""
         try:
-            response = self.session.get(f"{BASE_URL}/upload/embedding-stats", timeout=10)
+            response = await self.client.get("/upload/embedding-stats", timeout=10)
             if response.status_code == 200:
-                data = response.json()
-                self.log_test("Embedding Stats", "✅ PASS", {
+                data = _json(response)
+                self.log_test("Embedding Stats", Status.PASS, {
                     "embedding_available": data.get("embedding_available"),
                     "total_chunks": data.get("total_chunks"),
                     "unique_sources": data.get("unique_sources"),
@@ -133,23 +229,23 @@ class BackendQATester:
                 })
                 return data
             else:
-                self.log_test("Embedding Stats", "❌ FAIL", error=f"Status code: {response.status_code}")
+                self.log_test("Embedding Stats", Status.FAIL, error=f"Status code: {response.status_code}")
                 return None
         except Exception as e:
-            self.log_test("Embedding Stats", "❌ FAIL", error=e)
+            self.log_test("Embedding Stats", Status.FAIL, error=e)
             return None
     
-    def test_chat_endpoint(self, message, expected_keywords=None):
+    async def test_chat_endpoint(self, message, expected_keywords=None, session_id="test_session"):
         """Test chat endpoint functionality"""
         try:
             data = {
                 "message": message,
-                "session_id": "test_session"
+                "session_id": session_id
             }
-            response = self.session.post(f"{BASE_URL}/chat", data=data, timeout=30)
+            response = await self.client.post("/chat", data=data, timeout=30)
             
             if response.status_code == 200:
-                result = response.json()
+                result = _json(response)
                 details = {
                     "model": result.get("model"),
                     "input_type": result.get("input_type"),
@@ -163,31 +259,27 @@ class BackendQATester:
                     found_keywords = [kw for kw in expected_keywords if kw.lower() in response_text]
                     details["found_keywords"] = found_keywords
                 
-                self.log_test(f"Chat: {message[:30]}...", "✅ PASS", details)
+                self.log_test(f"Chat: {message[:30]}...", Status.PASS, details)
                 return result
             else:
-                self.log_test(f"Chat: {message[:30]}...", "❌ FAIL", error=f"Status code: {response.status_code}, Response: {response.text}")
+                self.log_test(f"Chat: {message[:30]}...", Status.FAIL, error=f"Status code: {response.status_code}, Response: {response.text}")
                 return None
                 
         except Exception as e:
-            self.log_test(f"Chat: {message[:30]}...", "❌ FAIL", error=e)
+            self.log_test(f"Chat: {message[:30]}...", Status.FAIL, error=e)
             return None
     
-    def test_chat_with_file(self, message, filename, content):
+    async def test_chat_with_file(self, message, filename):
         """Test chat endpoint with file upload"""
         try:
-            # Create test file
-            file_path = self.create_test_file(filename, content)
-            
-            # Send chat with file
-            with open(file_path, 'rb') as f:
-                files = {'files': (filename, f, 'application/octet-stream')}
-                data = {'message': message, 'session_id': 'test_session_with_file'}
-                response = self.session.post(f"{BASE_URL}/chat", files=files, data=data, timeout=30)
+            # Send chat with the cached fixture bytes
+            files = {'files': (filename, FIXTURES[filename], 'application/octet-stream')}
+            data = {'message': message, 'session_id': 'test_session_with_file'}
+            response = await self.client.post("/chat", files=files, data=data, timeout=30)
             
             if response.status_code == 200:
-                result = response.json()
-                self.log_test(f"Chat with File: {filename}", "✅ PASS", {
+                result = _json(response)
+                self.log_test(f"Chat with File: {filename}", Status.PASS, {
                     "model": result.get("model"),
                     "input_type": result.get("input_type"),
                     "processed_files": result.get("processed_files"),
@@ -196,181 +288,174 @@ class BackendQATester:
                 })
                 return result
             else:
-                self.log_test(f"Chat with File: {filename}", "❌ FAIL", error=f"Status code: {response.status_code}, Response: {response.text}")
+                self.log_test(f"Chat with File: {filename}", Status.FAIL, error=f"Status code: {response.status_code}, Response: {response.text}")
                 return None
                 
         except Exception as e:
-            self.log_test(f"Chat with File: {filename}", "❌ FAIL", error=e)
+            self.log_test(f"Chat with File: {filename}", Status.FAIL, error=e)
             return None
     
-    def test_history_endpoint(self):
+    async def test_history_endpoint(self):
         """Test activity history endpoint"""
         try:
-            response = self.session.get(f"{BASE_URL}/history/activity", timeout=10)
+            response = await self.client.get("/history/activity", timeout=10)
             if response.status_code == 200:
-                data = response.json()
-                self.log_test("Activity History", "✅ PASS", {
+                data = _json(response)
+                self.log_test("Activity History", Status.PASS, {
                     "total_activities": len(data.get("activities", [])),
                     "recent_count": len(data.get("recent", [])) if "recent" in data else "N/A"
                 })
                 return data
             else:
-                self.log_test("Activity History", "❌ FAIL", error=f"Status code: {response.status_code}")
+                self.log_test("Activity History", Status.FAIL, error=f"Status code: {response.status_code}")
                 return None
         except Exception as e:
-            self.log_test("Activity History", "❌ FAIL", error=e)
+            self.log_test("Activity History", Status.FAIL, error=e)
             return None
     
-    def test_upload_history(self):
+    async def test_upload_history(self):
         """Test upload history endpoint"""
         try:
-            response = self.session.get(f"{BASE_URL}/upload/history", timeout=10)
+            response = await self.client.get("/upload/history", timeout=10)
             if response.status_code == 200:
-                data = response.json()
-                self.log_test("Upload History", "✅ PASS", {
+                data = _json(response)
+                self.log_test("Upload History", Status.PASS, {
                     "files_count": len(data.get("files", []))
                 })
                 return data
             else:
-                self.log_test("Upload History", "❌ FAIL", error=f"Status code: {response.status_code}")
+                self.log_test("Upload History", Status.FAIL, error=f"Status code: {response.status_code}")
                 return None
         except Exception as e:
-            self.log_test("Upload History", "❌ FAIL", error=e)
+            self.log_test("Upload History", Status.FAIL, error=e)
             return None
     
-    def test_tools_endpoint(self):
+    async def test_tools_endpoint(self):
         """Test available tools endpoint"""
         try:
-            response = self.session.get(f"{BASE_URL}/tools/available", timeout=10)
+            response = await self.client.get("/tools/available", timeout=10)
             if response.status_code == 200:
-                data = response.json()
-                self.log_test("Available Tools", "✅ PASS", {
+                data = _json(response)
+                self.log_test("Available Tools", Status.PASS, {
                     "tool_count": data.get("tool_count"),
                     "status": data.get("status")
                 })
                 return data
             else:
-                self.log_test("Available Tools", "❌ FAIL", error=f"Status code: {response.status_code}")
+                self.log_test("Available Tools", Status.FAIL, error=f"Status code: {response.status_code}")
                 return None
         except Exception as e:
-            self.log_test("Available Tools", "❌ FAIL", error=e)
+            self.log_test("Available Tools", Status.FAIL, error=e)
             return None
     
-    def run_comprehensive_tests(self):
-        """Run all tests in sequence"""
+    async def run_comprehensive_tests(self):
+        """Run all tests, with independent probes of each stage in flight together"""
+        try:
+            await self._run_test_waves()
+        finally:
+            await self.client.aclose()
+    
+    async def _run_test_waves(self):
+        """Run the test stages in order; only the probes inside a stage run concurrently"""
         print("🧪 Starting Comprehensive Backend QA Tests")
         print("=" * 60)
         
-        # Wait for backend startup
+        # Wait for backend startup - returns as soon as it answers
         print("⏳ Waiting for backend startup...")
-        time.sleep(5)
+        await self.wait_for_backend()
         
         # Test 1: Basic connectivity
         print("\n📡 Testing Basic Connectivity...")
-        if not self.test_root_endpoint():
+        root_ok, _ = await asyncio.gather(self.test_root_endpoint(), self.test_health_check())
+        if not root_ok:
             print("❌ Backend not accessible, stopping tests")
             return
         
-        self.test_health_check()
-        
-        # Test 2: File uploads
+        # Test 2: File uploads (text file with reminder content, CSV file)
         print("\n📤 Testing File Uploads...")
+        await asyncio.gather(
+            self.test_file_upload("test.txt", "text"),
+            self.test_file_upload("test.csv", "csv"),
+        )
         
-        # Test text file with reminder content
-        txt_content = """Test Document for Backend QA
-
-This is a sample text file for testing.
-
-Important Information:
-- Omar visa renewal: 2027-11-20
-- Project deadline: 2024-02-15
-- Meeting scheduled: 2024-01-30 at 2:00 PM
-
-Content for analysis and embedding testing."""
-        
-        self.test_file_upload("test.txt", txt_content, "text")
-        
-        # Test CSV file
-        csv_content = """Name,Date,Task,Priority,Status
-Omar,2027-11-20,Visa renewal,High,Pending
-Sarah,2024-02-15,Project deadline,Critical,Active
-Mike,2024-01-30,Team meeting,Medium,Scheduled"""
-        
-        self.test_file_upload("test.csv", csv_content, "csv")
-        
-        # Test 3: Embedding functionality
-        print("\n🧠 Testing Embedding System...")
-        self.test_embedding_stats()
+        # Test 3: Embedding functionality and tools (both only need the uploads)
+        print("\n🧠 Testing Embedding System and Tools Endpoint...")
+        await asyncio.gather(self.test_embedding_stats(), self.test_tools_endpoint())
         
-        # Test 4: Chat functionality
+        # Test 4: Chat functionality - the prompts are independent, so each gets
+        # its own session_id and all three LLM round-trips overlap
         print("\n💬 Testing Chat Endpoints...")
-        self.test_chat_endpoint("Hello, how are you?")
-        self.test_chat_endpoint("Summarize the uploaded document.", ["document", "summarize"])
-        self.test_chat_endpoint("Create a reminder for Omar visa renewal on 2027-11-20", ["reminder", "visa"])
+        await asyncio.gather(
+            self.test_chat_endpoint("Hello, how are you?", session_id="test_session_greeting"),
+            self.test_chat_endpoint("Summarize the uploaded document.", ["document", "summarize"], session_id="test_session_summary"),
+            self.test_chat_endpoint("Create a reminder for Omar visa renewal on 2027-11-20", ["reminder", "visa"], session_id="test_session_reminder"),
+        )
         
         # Test 5: Chat with file upload
         print("\n📁 Testing Chat with File Upload...")
-        reminder_content = "Important: Omar visa renewal due on 2027-11-20. Please prepare documents."
-        self.test_chat_with_file("What reminders are in this document?", "reminder_doc.txt", reminder_content)
+        await self.test_chat_with_file("What reminders are in this document?", "reminder_doc.txt")
         
-        # Test 6: History endpoints
+        # Test 6: History endpoints (after the chats, so their activity is recorded)
         print("\n📊 Testing History Endpoints...")
-        self.test_history_endpoint()
-        self.test_upload_history()
-        
-        # Test 7: Tools endpoint
-        print("\n🔧 Testing Tools Endpoint...")
-        self.test_tools_endpoint()
+        await asyncio.gather(self.test_history_endpoint(), self.test_upload_history())
         
         # Generate final report
         self.generate_report()
     
     def generate_report(self):
         """Generate comprehensive test report"""
-        print("\n" + "=" * 60)
-        print("🎯 COMPREHENSIVE QA TEST REPORT")
-        print("=" * 60)
+        lines = [
+            "",
+            "=" * 60,
+            "🎯 COMPREHENSIVE QA TEST REPORT",
+            "=" * 60,
+        ]
         
+        # One pass over the results for the counts and the detailed lines
         total_tests = len(self.test_results)
-        passed_tests = len([r for r in self.test_results.values() if r["status"] == "✅ PASS"])
+        passed_tests = 0
+        critical_passed = 0
+        detail_lines = []
+        for test_name, result in self.test_results.items():
+            status = result["status"]
+            detail_lines.append(f"  {STATUS_LABELS[status]} {test_name}")
+            if status is Status.PASS:
+                passed_tests += 1
+                if test_name in CRITICAL_TESTS:
+                    critical_passed += 1
+            elif status is Status.FAIL:
+                detail_lines.append(f"    Error: {result.get('error', 'Unknown error')}")
         failed_tests = total_tests - passed_tests
         
-        print(f"📊 Total Tests: {total_tests}")
-        print(f"✅ Passed: {passed_tests}")
-        print(f"❌ Failed: {failed_tests}")
-        print(f"📈 Success Rate: {(passed_tests/total_tests)*100:.1f}%")
+        lines.append(f"📊 Total Tests: {total_tests}")
+        lines.append(f"✅ Passed: {passed_tests}")
+        lines.append(f"❌ Failed: {failed_tests}")
+        lines.append(f"📈 Success Rate: {(passed_tests/total_tests)*100:.1f}%")
         
-        print("\n📋 Detailed Results:")
-        for test_name, result in self.test_results.items():
-            print(f"  {result['status']} {test_name}")
-            if result["status"] == "❌ FAIL":
-                print(f"    Error: {result.get('error', 'Unknown error')}")
+        lines.append("\n📋 Detailed Results:")
+        lines.extend(detail_lines)
         
         # Production readiness assessment
-        print("\n🚀 Production Readiness Assessment:")
-        
-        critical_tests = [
-            "Root Endpoint", "Health Check", "Upload test.txt", "Upload test.csv", 
-            "Chat: Hello, how are you?...", "Embedding Stats"
-        ]
-        
-        critical_passed = len([t for t in critical_tests if t in self.test_results and self.test_results[t]["status"] == "✅ PASS"])
+        lines.append("\n🚀 Production Readiness Assessment:")
         
-        if critical_passed == len(critical_tests):
-            print("✅ PRODUCTION READY")
-            print("   - File uploads → parsed cleanly")
-            print("   - Embeddings → available (if configured)")
-            print("   - Chat → responding correctly")
-            print("   - History → tracking events")
+        if critical_passed == len(CRITICAL_TESTS):
+            lines.append("✅ PRODUCTION READY")
+            lines.append("   - File uploads → parsed cleanly")
+            lines.append("   - Embeddings → available (if configured)")
+            lines.append("   - Chat → responding correctly")
+            lines.append("   - History → tracking events")
         else:
-            print("⚠️ NOT PRODUCTION READY")
-            print(f"   Critical tests failed: {len(critical_tests) - critical_passed}/{len(critical_tests)}")
+            lines.append("⚠️ NOT PRODUCTION READY")
+            lines.append(f"   Critical tests failed: {len(CRITICAL_TESTS) - critical_passed}/{len(CRITICAL_TESTS)}")
+        
+        # Emit the whole report with a single write
+        sys.stdout.write("\n".join(lines) + "\n")
+        sys.stdout.flush()
         
         # Save results to file
-        with open("qa_test_results.json", "w") as f:
-            json.dump(self.test_results, f, indent=2)
+        _save_json("qa_test_results.json", _labelled(self.test_results))
         print(f"\n💾 Full results saved to: qa_test_results.json")
 
 if __name__ == "__main__":
     tester = BackendQATester()
-    tester.run_comprehensive_tests() 
\ No newline at end of file
+    asyncio.run(tester.run_comprehensive_tests()) 
\ No newline at end of file
@@ -1,6 +1,16 @@
 import requests
+import requests.adapters
 import json
 from datetime import datetime
+from urllib3.util.retry import Retry
+
+# Shared keep-alive session; retries transient gateway errors on idempotent calls
+SESSION = requests.Session()
+SESSION.mount("http://", requests.adapters.HTTPAdapter(
+    pool_connections=16,
+    pool_maxsize=32,
+    max_retries=Retry(total=2, backoff_factor=0.1, status_forcelist=[502, 503, 504], raise_on_status=False),
+))
 
 def test_complete_workflow():
     """Test the complete PDF reminder extraction workflow"""
@@ -11,7 +21,7 @@ def test_complete_workflow():
     # Test 1: Health check
     print("1. Testing Health Check...")
     try:
-        response = requests.get(f"{base_url}/health")
+        response = SESSION.get(f"{base_url}/health")
         print(f"   ✅ Status: {response.status_code}")
         print(f"   Response: {response.json()}\n")
     except Exception as e:
@@ -21,7 +31,7 @@ def test_complete_workflow():
     # Test 2: Root endpoint with API info
     print("2. Testing Root Endpoint...")
     try:
-        response = requests.get(f"{base_url}/")
+        response = SESSION.get(f"{base_url}/")
         print(f"   ✅ Status: {response.status_code}")
         data = response.json()
         print(f"   Message: {data['msg']}")
@@ -55,7 +65,7 @@ def test_complete_workflow():
             "user_id": "test_user"
         }
         
-        response = requests.post(f"{base_url}/confirm", json=confirm_data)
+        response = SESSION.post(f"{base_url}/confirm", json=confirm_data)
         print(f"   ✅ Status: {response.status_code}")
         result = response.json()
         print(f"   Message: {result['message']}")
@@ -67,7 +77,7 @@ def test_complete_workflow():
     # Test 5: Get grouped reminders
     print("5. Testing Get Reminders (Grouped by Date)...")
     try:
-        response = requests.get(f"{base_url}/reminders?user_id=test_user")
+        response = SESSION.get(f"{base_url}/reminders?user_id=test_user")
         print(f"   ✅ Status: {response.status_code}")
         data = response.json()
         
@@ -98,7 +108,7 @@ def test_complete_workflow():
     # Test 6: Test the exact format requested
     print("6. Validating Exact Response Format...")
     try:
-        response = requests.get(f"{base_url}/reminders?user_id=test_user")
+        response = SESSION.get(f"{base_url}/reminders?user_id=test_user")
         data = response.json()
         
         print("   Expected format example:")
@@ -139,11 +149,11 @@ def test_complete_workflow():
             "user_id": "test_user"
         }
         
-        response = requests.post(f"{base_url}/confirm", json=confirm_data)
+        response = SESSION.post(f"{base_url}/confirm", json=confirm_data)
         print(f"   ✅ Added {len(additional_reminders)} more reminders")
         
         # Get updated grouped reminders
-        response = requests.get(f"{base_url}/reminders?user_id=test_user")
+        response = SESSION.get(f"{base_url}/reminders?user_id=test_user")
         data = response.json()
         
         print(f"   Updated grouped reminders:")
@@ -5,57 +5,200 @@ Tests all API endpoints used by the React frontend
 """
 
 import requests
+import requests.adapters
+import os
+import sys
 import json
 import time
+import asyncio
 from datetime import datetime
+from enum import IntEnum
+from pathlib import Path
+from urllib3.util.retry import Retry
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
 
 # Configuration
 BACKEND_URL = "http://localhost:8000"
 FRONTEND_URL = "http://localhost:5173"
 
+# Bodies this large are only excerpted in results, never decoded whole
+MAX_JSON_BYTES = 1_000_000
+
+# Shared keep-alive session; retries transient gateway errors on idempotent calls
+SESSION = requests.Session()
+SESSION.mount("http://", requests.adapters.HTTPAdapter(
+    pool_connections=16,
+    pool_maxsize=32,
+    max_retries=Retry(total=2, backoff_factor=0.1, status_forcelist=[502, 503, 504], raise_on_status=False),
+))
+
+class Status(IntEnum):
+    """Test outcome; the emoji label is only looked up when printing or saving"""
+    FAIL = 0
+    PASS = 1
+    SKIP = 2
+    MANUAL = 3
+
+STATUS_LABELS = {
+    Status.FAIL: "❌ FAIL",
+    Status.PASS: "✅ PASS",
+    Status.SKIP: "SKIP",
+    Status.MANUAL: "ℹ️  MANUAL",
+}
+
+def _labelled(results):
+    """Results with readable status labels, for the saved JSON"""
+    return {name: {**result, "status": STATUS_LABELS[result["status"]]} for name, result in results.items()}
+
+# Supported methods -> (session call, timeout in seconds)
+METHODS = {
+    "GET": (SESSION.get, 10),
+    "POST": (SESSION.post, 30),
+}
+
 def test_endpoint(method, endpoint, data=None, files=None, expected_status=200):
     """Test a single endpoint and return results"""
-    url = f"{BACKEND_URL}{endpoint}"
+    url = URLS.get(endpoint) or f"{BACKEND_URL}{endpoint}"
+    
+    call = METHODS.get(method.upper())
+    if call is None:
+        return {"status": Status.SKIP, "reason": f"Method {method} not implemented"}
+    send, timeout = call
     
+    kwargs = {"timeout": timeout}
+    if files:
+        kwargs.update(data=data, files=files)
+    elif data:
+        kwargs["json"] = data
+    
+    try:
+        response = send(url, **kwargs)
+        return _summarize_response(response, expected_status)
+    except requests.exceptions.RequestException as e:
+        return {
+            "status": Status.FAIL,
+            "error": str(e)
+        }
+
+def _save_json(path, payload):
+    """Write results as indented JSON via a temp file and rename, so a crash never leaves a partial file"""
+    if orjson is not None:
+        data = orjson.dumps(payload, option=orjson.OPT_INDENT_2)
+    else:
+        data = json.dumps(payload, indent=2).encode("utf-8")
+    tmp = Path(f"{path}.tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+def _json(response):
+    """Decode a JSON response body straight from its bytes, with orjson when available"""
+    if orjson is not None:
+        return orjson.loads(response.content)
+    return response.json()
+
+def _snippet(response, limit):
+    """First `limit` bytes of the body as text, without decoding the rest"""
+    return response.content[:limit].decode("utf-8", errors="replace")
+
+def _summarize_response(response, expected_status):
+    """Turn a requests or httpx response into a test result"""
+    if response.status_code == expected_status:
+        try:
+            if len(response.content) >= MAX_JSON_BYTES:
+                raise ValueError("response too large to decode")
+            response_data = _json(response)
+            return {
+                "status": Status.PASS,
+                "response_time": f"{response.elapsed.total_seconds():.3f}s",
+                "data": response_data
+            }
+        except:
+            return {
+                "status": Status.PASS,
+                "response_time": f"{response.elapsed.total_seconds():.3f}s",
+                "data": _snippet(response, 200)
+            }
+    else:
+        return {
+            "status": Status.FAIL,
+            "error": f"HTTP {response.status_code}",
+            "response": _snippet(response, 200)
+        }
+
+async def atest_endpoint(client, method, endpoint, data=None, files=None, expected_status=200):
+    """Async variant of test_endpoint on a shared httpx.AsyncClient"""
     try:
         if method.upper() == "GET":
-            response = requests.get(url, timeout=10)
+            response = await client.get(endpoint, timeout=10)
         elif method.upper() == "POST":
             if files:
-                response = requests.post(url, data=data, files=files, timeout=30)
+                response = await client.post(endpoint, data=data, files=files, timeout=30)
             elif data:
-                response = requests.post(url, json=data, timeout=30)
+                response = await client.post(endpoint, json=data, timeout=30)
             else:
-                response = requests.post(url, timeout=30)
-        else:
-            return {"status": "SKIP", "reason": f"Method {method} not implemented"}
-
-        if response.status_code == expected_status:
-            try:
-                response_data = response.json()
-                return {
-                    "status": "✅ PASS",
-                    "response_time": f"{response.elapsed.total_seconds():.3f}s",
-                    "data": response_data
-                }
-            except:
-                return {
-                    "status": "✅ PASS",
-                    "response_time": f"{response.elapsed.total_seconds():.3f}s",
-                    "data": response.text[:200]
-                }
+                response = await client.post(endpoint, timeout=30)
         else:
-            return {
-                "status": "❌ FAIL",
-                "error": f"HTTP {response.status_code}",
-                "response": response.text[:200]
-            }
-    except requests.exceptions.RequestException as e:
+            return {"status": Status.SKIP, "reason": f"Method {method} not implemented"}
+
+        return _summarize_response(response, expected_status)
+    except httpx.HTTPError as e:
         return {
-            "status": "❌ FAIL",
+            "status": Status.FAIL,
             "error": str(e)
         }
 
+async def _run_probes(probes):
+    """Run (method, endpoint, data, files) probes concurrently over one connection pool"""
+    async with httpx.AsyncClient(base_url=BACKEND_URL) as client:
+        return await asyncio.gather(*[atest_endpoint(client, *probe) for probe in probes])
+
+# (method, endpoint, description[, data[, files]]) for every probe
+TESTS = [
+    # Core status endpoints
+    ("GET", "/", "Root endpoint"),
+    ("GET", "/health", "Health check"),
+    ("GET", "/status", "Status endpoint (NEW)"),
+    
+    # Chat endpoints
+    ("POST", "/chat", "Chat endpoint", {"message": "Hello, test connection"}),
+    ("GET", "/tools/available", "Available tools"),
+    
+    # File upload endpoint  
+    ("POST", "/upload/", "File upload", None, {"test_file": ("test.txt", "This is a test file content", "text/plain")}),
+    
+    # Reminder endpoints
+    ("GET", "/reminders/all", "Get reminders"),
+    ("POST", "/reminders/", "Create reminder", {
+        "title": "Test Reminder",
+        "due_date": "2024-12-31",
+        "description": "Test reminder created by connection test"
+    }),
+    
+    # History endpoints
+    ("GET", "/history/activity", "Activity history"),
+    
+    # Confirmation endpoint
+    ("POST", "/confirm/", "Confirm action", {
+        "decision": "yes",
+        "session_id": "test_session_123"
+    }),
+    
+    # Test endpoint
+    ("POST", "/test/full", "Full backend test"),
+]
+
+# Full request URLs, built once instead of formatting per call
+URLS = {test[1]: BACKEND_URL + test[1] for test in TESTS}
+
 def run_comprehensive_test():
     """Run comprehensive test of all endpoints"""
     print("🚀 FRONTEND-BACKEND CONNECTION TEST")
@@ -65,62 +208,40 @@ def run_comprehensive_test():
     print(f"Started: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     print("=" * 60)
 
-    tests = [
-        # Core status endpoints
-        ("GET", "/", "Root endpoint"),
-        ("GET", "/health", "Health check"),
-        ("GET", "/status", "Status endpoint (NEW)"),
-        
-        # Chat endpoints
-        ("POST", "/chat", "Chat endpoint", {"message": "Hello, test connection"}),
-        ("GET", "/tools/available", "Available tools"),
-        
-        # File upload endpoint  
-        ("POST", "/upload/", "File upload", None, {"test_file": ("test.txt", "This is a test file content", "text/plain")}),
-        
-        # Reminder endpoints
-        ("GET", "/reminders/all", "Get reminders"),
-        ("POST", "/reminders/", "Create reminder", {
-            "title": "Test Reminder",
-            "due_date": "2024-12-31",
-            "description": "Test reminder created by connection test"
-        }),
-        
-        # History endpoints
-        ("GET", "/history/activity", "Activity history"),
-        
-        # Confirmation endpoint
-        ("POST", "/confirm/", "Confirm action", {
-            "decision": "yes",
-            "session_id": "test_session_123"
-        }),
-        
-        # Test endpoint
-        ("POST", "/test/full", "Full backend test"),
-    ]
-
+    tests = TESTS
     results = {}
     total_tests = len(tests)
     passed_tests = 0
     failed_tests = 0
 
-    for i, test_data in enumerate(tests, 1):
+    probes = [
+        (test_data[0], test_data[1],
+         test_data[3] if len(test_data) > 3 else None,
+         test_data[4] if len(test_data) > 4 else None)
+        for test_data in tests
+    ]
+    
+    # The probes are independent, so put them all in flight at once when httpx is available
+    if httpx is not None:
+        probe_results = asyncio.run(_run_probes(probes))
+    else:
+        probe_results = [test_endpoint(*probe) for probe in probes]
+
+    # Report in test order so the log stays deterministic
+    for i, (test_data, result) in enumerate(zip(tests, probe_results), 1):
         method, endpoint, description = test_data[:3]
-        data = test_data[3] if len(test_data) > 3 else None
-        files = test_data[4] if len(test_data) > 4 else None
         
         print(f"\n[{i:2d}/{total_tests}] Testing {description}")
         print(f"       {method} {endpoint}")
         
-        result = test_endpoint(method, endpoint, data, files)
         results[endpoint] = result
         
-        if result["status"].startswith("✅"):
+        if result["status"] is Status.PASS:
             passed_tests += 1
-            print(f"       {result['status']} ({result.get('response_time', 'N/A')})")
+            print(f"       {STATUS_LABELS[Status.PASS]} ({result.get('response_time', 'N/A')})")
         else:
             failed_tests += 1
-            print(f"       {result['status']} - {result.get('error', 'Unknown error')}")
+            print(f"       {STATUS_LABELS[result['status']]} - {result.get('error', 'Unknown error')}")
     
     # Test proxy functionality
     print(f"\n[{total_tests + 1}] Testing Vite proxy functionality")
@@ -135,9 +256,9 @@ def run_comprehensive_test():
         cd frontend && npm run dev       # Terminal 2
         """
         print(proxy_test_note)
-        results["/api/*"] = {"status": "ℹ️  MANUAL", "note": "Test by visiting frontend"}
+        results["/api/*"] = {"status": Status.MANUAL, "note": "Test by visiting frontend"}
     except Exception as e:
-        results["/api/*"] = {"status": "❌ FAIL", "error": str(e)}
+        results["/api/*"] = {"status": Status.FAIL, "error": str(e)}
 
     # Summary
     print("\n" + "=" * 60)
@@ -156,16 +277,16 @@ def run_comprehensive_test():
     else:
         print(f"\n⚠️  {failed_tests} test(s) failed. Check backend server status.")
         
-    # Detailed results for debugging
-    print(f"\n📋 DETAILED RESULTS:")
+    # Detailed results for debugging, emitted with a single write
+    lines = ["\n📋 DETAILED RESULTS:"]
     for endpoint, result in results.items():
         status = result["status"]
-        if status.startswith("❌"):
-            print(f"   {endpoint}: {status} - {result.get('error', 'No details')}")
-        elif status.startswith("✅"):
-            print(f"   {endpoint}: {status}")
+        if status is Status.FAIL:
+            lines.append(f"   {endpoint}: {STATUS_LABELS[status]} - {result.get('error', 'No details')}")
         else:
-            print(f"   {endpoint}: {status}")
+            lines.append(f"   {endpoint}: {STATUS_LABELS[status]}")
+    sys.stdout.write("\n".join(lines) + "\n")
+    sys.stdout.flush()
 
     return passed_tests, failed_tests, results
 
@@ -174,15 +295,14 @@ if __name__ == "__main__":
         passed, failed, results = run_comprehensive_test()
         
         # Save results to file
-        with open("connection_test_results.json", "w") as f:
-            json.dump({
-                "timestamp": datetime.now().isoformat(),
-                "passed": passed,
-                "failed": failed,
-                "results": results,
-                "backend_url": BACKEND_URL,
-                "frontend_url": FRONTEND_URL
-            }, f, indent=2)
+        _save_json("connection_test_results.json", {
+            "timestamp": datetime.now().isoformat(),
+            "passed": passed,
+            "failed": failed,
+            "results": _labelled(results),
+            "backend_url": BACKEND_URL,
+            "frontend_url": FRONTEND_URL
+        })
             
         print(f"\n📁 Results saved to: connection_test_results.json")
         
@@ -4,11 +4,9 @@ Quick test script to verify frontend 404 fix
 Usage: python test_frontend_fix.py
 """
 
-import subprocess
-import time
-import requests
 import sys
 import os
+from pathlib import Path
 
 def test_frontend_startup():
     """Test if frontend starts correctly and serves pages"""
@@ -16,15 +14,22 @@ def test_frontend_startup():
     print("🧪 Testing Frontend Fix...")
     print("=" * 50)
     
+    # One listing of frontend/ answers both file checks below
+    try:
+        with os.scandir('frontend') as it:
+            frontend_files = {entry.name for entry in it if entry.is_file()}
+    except OSError:
+        frontend_files = set()
+    
     # Check if we're in the right directory
-    if not os.path.exists('frontend/package.json'):
+    if 'package.json' not in frontend_files:
         print("❌ Please run this from the root project directory")
         return False
     
     print("✅ Project structure looks correct")
     
     # Check if index.html exists in frontend
-    if os.path.exists('frontend/index.html'):
+    if 'index.html' in frontend_files:
         print("✅ frontend/index.html exists")
     else:
         print("❌ frontend/index.html missing")
@@ -32,17 +37,17 @@ def test_frontend_startup():
     
     # Check if App.tsx has proper routing
     try:
-        with open('frontend/src/App.tsx', 'r') as f:
-            app_content = f.read()
-            if 'Navigate' in app_content and 'path="*"' in app_content:
-                print("✅ App.tsx has fallback route")
-            else:
-                print("❌ App.tsx missing fallback route")
-                return False
-    except:
+        app_content = Path('frontend/src/App.tsx').read_text(encoding='utf-8')
+    except (OSError, UnicodeDecodeError):
         print("❌ Could not read App.tsx")
         return False
     
+    if 'Navigate' in app_content and 'path="*"' in app_content:
+        print("✅ App.tsx has fallback route")
+    else:
+        print("❌ App.tsx missing fallback route")
+        return False
+    
     print("\n🎉 All frontend fixes applied successfully!")
     print("\n📋 Next Steps:")
     print("1. cd frontend")
@@ -6,12 +6,22 @@ Tests all frontend-backend integrations
 Usage: python validate_integration.py
 """
 
+import io
+import re
 import requests
+import requests.adapters
 import json
-import time
 import sys
+import threading
+from dataclasses import dataclass
+from concurrent.futures import ThreadPoolExecutor, wait
 from pathlib import Path
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 class Colors:
     HEADER = '\033[95m'
     BLUE = '\033[94m'
@@ -22,56 +32,175 @@ class Colors:
     ENDC = '\033[0m'
     BOLD = '\033[1m'
 
+# Redirected output (log files, CI) gets plain text without escape codes
+if not sys.stdout.isatty():
+    for _name in ('HEADER', 'BLUE', 'CYAN', 'GREEN', 'YELLOW', 'RED', 'ENDC', 'BOLD'):
+        setattr(Colors, _name, '')
+
+# Status prefixes, coloured once at import instead of on every result
+PASS_PREFIX = f"{Colors.GREEN}✅ PASS{Colors.ENDC}"
+FAIL_PREFIX = f"{Colors.RED}❌ FAIL{Colors.ENDC}"
+_OK = f"{Colors.GREEN}✅{Colors.ENDC}"
+_FAIL = f"{Colors.RED}❌{Colors.ENDC}"
+
+# Tests are independent network probes, so they run concurrently
+MAX_WORKERS = 8
+
+# Upload payloads, kept as bytes so they are sent without re-encoding per run
+TEST_CONSTRUCTION_BYTES = b"""CONSTRUCTION PROJECT REPORT
+Project: Test Building
+Date: 2024-01-15
+Status: In Progress
+Budget: $50,000
+Tasks:
+- Foundation: Complete
+- Framing: In Progress
+- Electrical: Pending
+"""
+
+TEST_SCHEDULE_BYTES = b"""CONSTRUCTION SCHEDULE
+Phase 1: Site Preparation (Week 1-2)
+Phase 2: Foundation (Week 3-4) 
+Phase 3: Framing (Week 5-7)
+Phase 4: Electrical & Plumbing (Week 8-9)
+Phase 5: Finishing (Week 10-12)
+Total Budget: $75,000
+Project Manager: John Smith
+"""
+
+# Words showing a chat reply drew on the uploaded schedule, matched in one pass
+CONTEXT_KEYWORDS_RE = re.compile(r"construction|schedule|budget|phase|week", re.IGNORECASE)
+
+# Leading bytes of the frontend page read to recognise it; the markers sit in <head>
+FRONTEND_SNIFF_BYTES = 2048
+
+# test name -> the test that must finish before it starts
+TEST_DEPENDENCIES = {"test_contextual_chat": "test_upload_endpoint"}
+
+# test name -> (gating test, result name); when the gating test fails the
+# test is recorded as skipped instead of waiting out its timeouts
+TEST_GATES = {
+    "test_backend_startup": ("test_backend_health", "Backend Startup Check"),
+    "test_chat_endpoint": ("test_backend_health", "Chat Endpoint (Plain)"),
+    "test_upload_endpoint": ("test_backend_health", "File Upload"),
+    "test_reminders_endpoint": ("test_backend_health", "Reminders Endpoint"),
+    "test_history_endpoint": ("test_backend_health", "History Endpoint"),
+    "test_contextual_chat": ("test_backend_health", "Contextual Chat"),
+    "test_frontend_proxy": ("test_frontend_accessibility", "Frontend Proxy"),
+}
+
+# gating test -> reason logged for the tests it skips
+GATE_REASONS = {
+    "test_backend_health": "backend down",
+    "test_frontend_accessibility": "frontend down",
+}
+
+@dataclass
+class TestResult:
+    """Outcome of one validation test"""
+    # Declared by hand rather than slots=True, which needs Python 3.10
+    __slots__ = ("name", "success", "details", "data")
+    name: str
+    success: bool
+    details: str
+    data: object
+
+def _json(response):
+    """Decode a JSON response body straight from its bytes, with orjson when available"""
+    if orjson is not None:
+        return orjson.loads(response.content)
+    return response.json()
+
+class _TestOutput(io.TextIOBase):
+    """sys.stdout stand-in that routes a worker thread's prints to its own buffer"""
+    
+    def __init__(self, stream):
+        self._stream = stream
+        self._local = threading.local()
+    
+    def write(self, text):
+        buffer = getattr(self._local, "buffer", None)
+        return (buffer if buffer is not None else self._stream).write(text)
+    
+    def flush(self):
+        self._stream.flush()
+    
+    def run_captured(self, test_func):
+        """Run a test, returning its result and everything it printed"""
+        self._local.buffer = io.StringIO()
+        try:
+            return test_func(), self._local.buffer.getvalue()
+        finally:
+            self._local.buffer = None
+
 class IntegrationValidator:
+    # (connect, read) timeouts: a dead local service fails to connect within
+    # CONNECT_TIMEOUT, while chat/upload reads still leave room for model inference
+    CONNECT_TIMEOUT = 0.5
+    READ_TIMEOUT_FAST = 5
+    READ_TIMEOUT_SLOW = 30
+    FAST_TIMEOUT = (CONNECT_TIMEOUT, READ_TIMEOUT_FAST)
+    SLOW_TIMEOUT = (CONNECT_TIMEOUT, READ_TIMEOUT_SLOW)
+    
     def __init__(self):
         self.backend_url = "http://localhost:8000"
         self.frontend_url = "http://localhost:5173"
         self.test_results = []
+        self._results_lock = threading.Lock()
+        # Shared by every test and the pre-check, so probes reuse pooled
+        # keep-alive connections; one pool per service, sized for the workers
+        self.session = requests.Session()
+        for url in (self.backend_url, self.frontend_url):
+            self.session.mount(url, requests.adapters.HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=0))
+        # Responses from main()'s pre-check, reused instead of requesting them again
+        self._cached_health = None
+        self._cached_frontend = None
         
     def log_test(self, test_name, success, details="", response_data=None):
         """Log test result"""
-        status = f"{Colors.GREEN}✅ PASS{Colors.ENDC}" if success else f"{Colors.RED}❌ FAIL{Colors.ENDC}"
-        self.test_results.append((test_name, success, details, response_data))
+        status = PASS_PREFIX if success else FAIL_PREFIX
+        with self._results_lock:
+            self.test_results.append(TestResult(test_name, success, details, response_data))
         
-        if success:
-            print(f"{status} {test_name}")
-            if details:
-                print(f"    └─ {Colors.CYAN}{details}{Colors.ENDC}")
-        else:
-            print(f"{status} {test_name}")
-            if details:
-                print(f"    └─ {Colors.YELLOW}{details}{Colors.ENDC}")
+        # One write per result instead of a print per line
+        lines = [f"{status} {test_name}"]
+        if details:
+            detail_color = Colors.CYAN if success else Colors.YELLOW
+            lines.append(f"    └─ {detail_color}{details}{Colors.ENDC}")
+        sys.stdout.write("\n".join(lines) + "\n")
 
     def test_backend_health(self):
         """Test backend health endpoint"""
         print(f"\n{Colors.BLUE}🔍 Testing Backend Health...{Colors.ENDC}")
         
         try:
-            response = requests.get(f"{self.backend_url}/health", timeout=10)
-            if response.status_code == 200:
-                data = response.json()
-                status = data.get('status', 'unknown')
-                services = data.get('services', {})
-                self.log_test(
-                    "Backend Health Check", 
-                    True, 
-                    f"Status: {status}, Services: {list(services.keys())}",
-                    data
-                )
-                return True
-            else:
-                self.log_test("Backend Health Check", False, f"HTTP {response.status_code}")
-                return False
-        except Exception as e:
+            data = self._cached_health
+            if data is None:
+                response = self.session.get(f"{self.backend_url}/health", timeout=self.FAST_TIMEOUT)
+                if response.status_code != 200:
+                    self.log_test("Backend Health Check", False, f"HTTP {response.status_code}")
+                    return False
+                data = _json(response)
+            
+            status = data.get('status', 'unknown')
+            services = data.get('services', {})
+            self.log_test(
+                "Backend Health Check", 
+                True, 
+                f"Status: {status}, Services: {list(services.keys())}",
+                data
+            )
+            return True
+        except (requests.exceptions.RequestException, ValueError, AttributeError) as e:
             self.log_test("Backend Health Check", False, str(e))
             return False
 
     def test_backend_startup(self):
         """Test backend startup check"""
         try:
-            response = requests.get(f"{self.backend_url}/startup-check", timeout=10)
+            response = self.session.get(f"{self.backend_url}/startup-check", timeout=self.FAST_TIMEOUT)
             if response.status_code == 200:
-                data = response.json()
+                data = _json(response)
                 all_routes_ready = data.get('all_routes_ready', False)
                 routes_loaded = data.get('routes_loaded', [])
                 self.log_test(
@@ -84,7 +213,7 @@ class IntegrationValidator:
             else:
                 self.log_test("Backend Startup Check", False, f"HTTP {response.status_code}")
                 return False
-        except Exception as e:
+        except (requests.exceptions.RequestException, ValueError, AttributeError) as e:
             self.log_test("Backend Startup Check", False, str(e))
             return False
 
@@ -95,10 +224,10 @@ class IntegrationValidator:
         try:
             # Test simple chat
             data = {'message': 'Hello, this is a test message'}
-            response = requests.post(f"{self.backend_url}/chat", data=data, timeout=30)
+            response = self.session.post(f"{self.backend_url}/chat", data=data, timeout=self.SLOW_TIMEOUT)
             
             if response.status_code == 200:
-                response_data = response.json()
+                response_data = _json(response)
                 chat_response = response_data.get('response', '')
                 model = response_data.get('model', 'unknown')
                 success_flag = response_data.get('success', False)
@@ -113,7 +242,7 @@ class IntegrationValidator:
             else:
                 self.log_test("Chat Endpoint (Plain)", False, f"HTTP {response.status_code}")
                 return False
-        except Exception as e:
+        except (requests.exceptions.RequestException, ValueError, AttributeError) as e:
             self.log_test("Chat Endpoint (Plain)", False, str(e))
             return False
 
@@ -122,23 +251,11 @@ class IntegrationValidator:
         print(f"\n{Colors.BLUE}📁 Testing Upload Endpoint...{Colors.ENDC}")
         
         try:
-            # Create a test file
-            test_content = """CONSTRUCTION PROJECT REPORT
-Project: Test Building
-Date: 2024-01-15
-Status: In Progress
-Budget: $50,000
-Tasks:
-- Foundation: Complete
-- Framing: In Progress
-- Electrical: Pending
-"""
-            
-            files = {'file': ('test_construction.txt', test_content, 'text/plain')}
-            response = requests.post(f"{self.backend_url}/upload", files=files, timeout=30)
+            files = {'file': ('test_construction.txt', TEST_CONSTRUCTION_BYTES, 'text/plain')}
+            response = self.session.post(f"{self.backend_url}/upload", files=files, timeout=self.SLOW_TIMEOUT)
             
             if response.status_code == 200:
-                data = response.json()
+                data = _json(response)
                 filename = data.get('filename', '')
                 file_type = data.get('file_type', '')
                 extracted_data = data.get('extracted_data', {})
@@ -153,7 +270,7 @@ Tasks:
             else:
                 self.log_test("File Upload", False, f"HTTP {response.status_code}")
                 return False
-        except Exception as e:
+        except (requests.exceptions.RequestException, ValueError, AttributeError) as e:
             self.log_test("File Upload", False, str(e))
             return False
 
@@ -162,10 +279,10 @@ Tasks:
         print(f"\n{Colors.BLUE}📅 Testing Reminders Endpoint...{Colors.ENDC}")
         
         try:
-            response = requests.get(f"{self.backend_url}/reminders/all", timeout=10)
+            response = self.session.get(f"{self.backend_url}/reminders/all", timeout=self.FAST_TIMEOUT)
             
             if response.status_code == 200:
-                data = response.json()
+                data = _json(response)
                 reminder_count = len(data) if isinstance(data, list) else 0
                 
                 self.log_test(
@@ -178,7 +295,7 @@ Tasks:
             else:
                 self.log_test("Reminders Endpoint", False, f"HTTP {response.status_code}")
                 return False
-        except Exception as e:
+        except (requests.exceptions.RequestException, ValueError, AttributeError) as e:
             self.log_test("Reminders Endpoint", False, str(e))
             return False
 
@@ -187,10 +304,10 @@ Tasks:
         print(f"\n{Colors.BLUE}📊 Testing History Endpoint...{Colors.ENDC}")
         
         try:
-            response = requests.get(f"{self.backend_url}/history/activity", timeout=10)
+            response = self.session.get(f"{self.backend_url}/history/activity", timeout=self.FAST_TIMEOUT)
             
             if response.status_code == 200:
-                data = response.json()
+                data = _json(response)
                 summary = data.get('summary', {})
                 total_chats = summary.get('total_chats', 0)
                 total_uploads = summary.get('total_uploads', 0)
@@ -205,34 +322,45 @@ Tasks:
             else:
                 self.log_test("History Endpoint", False, f"HTTP {response.status_code}")
                 return False
-        except Exception as e:
+        except (requests.exceptions.RequestException, ValueError, AttributeError) as e:
             self.log_test("History Endpoint", False, str(e))
             return False
 
+    def _sniff_frontend(self):
+        """Lower-cased first FRONTEND_SNIFF_BYTES of the frontend page, without downloading the rest"""
+        response = self.session.get(self.frontend_url, timeout=self.FAST_TIMEOUT, stream=True)
+        try:
+            return response.raw.read(FRONTEND_SNIFF_BYTES, decode_content=True).lower()
+        finally:
+            response.close()
+
     def test_frontend_accessibility(self):
         """Test frontend accessibility"""
         print(f"\n{Colors.BLUE}🌐 Testing Frontend...{Colors.ENDC}")
         
         try:
-            response = requests.get(self.frontend_url, timeout=10)
+            # Reachability from a HEAD request, so no body is transferred
+            response = self._cached_frontend
+            if response is None:
+                response = self.session.head(self.frontend_url, timeout=self.FAST_TIMEOUT, allow_redirects=True)
             
             if response.status_code == 200:
-                # Check if it's a proper HTML page
-                content = response.text
-                is_html = '<html' in content.lower() and '</html>' in content.lower()
-                has_react = 'react' in content.lower() or 'vite' in content.lower()
+                # Check if it's a proper HTML page from the first bytes only
+                content = self._sniff_frontend()
+                is_html = b'<html' in content
+                has_react = b'react' in content or b'vite' in content
                 
                 self.log_test(
                     "Frontend Accessibility", 
                     is_html, 
                     f"HTML page: {is_html}, React/Vite detected: {has_react}",
-                    {"content_length": len(content), "is_html": is_html}
+                    {"content_length": response.headers.get("content-length"), "is_html": is_html}
                 )
                 return is_html
             else:
                 self.log_test("Frontend Accessibility", False, f"HTTP {response.status_code}")
                 return False
-        except Exception as e:
+        except (requests.exceptions.RequestException, ValueError, AttributeError) as e:
             self.log_test("Frontend Accessibility", False, str(e))
             return False
 
@@ -242,10 +370,10 @@ Tasks:
         
         try:
             # Test proxy by calling backend through frontend
-            response = requests.get(f"{self.frontend_url}/api/health", timeout=10)
+            response = self.session.get(f"{self.frontend_url}/api/health", timeout=self.FAST_TIMEOUT)
             
             if response.status_code == 200:
-                data = response.json()
+                data = _json(response)
                 status = data.get('status', 'unknown')
                 
                 self.log_test(
@@ -258,7 +386,7 @@ Tasks:
             else:
                 self.log_test("Frontend Proxy", False, f"HTTP {response.status_code}")
                 return False
-        except Exception as e:
+        except (requests.exceptions.RequestException, ValueError, AttributeError) as e:
             self.log_test("Frontend Proxy", False, str(e))
             return False
 
@@ -268,32 +396,21 @@ Tasks:
         
         try:
             # First upload a file for context
-            test_content = """CONSTRUCTION SCHEDULE
-Phase 1: Site Preparation (Week 1-2)
-Phase 2: Foundation (Week 3-4) 
-Phase 3: Framing (Week 5-7)
-Phase 4: Electrical & Plumbing (Week 8-9)
-Phase 5: Finishing (Week 10-12)
-Total Budget: $75,000
-Project Manager: John Smith
-"""
-            
-            files = {'file': ('schedule.txt', test_content, 'text/plain')}
-            upload_response = requests.post(f"{self.backend_url}/upload", files=files, timeout=30)
+            files = {'file': ('schedule.txt', TEST_SCHEDULE_BYTES, 'text/plain')}
+            upload_response = self.session.post(f"{self.backend_url}/upload", files=files, timeout=self.SLOW_TIMEOUT)
             
             if upload_response.status_code == 200:
-                # Now test contextual chat
-                time.sleep(1)  # Brief pause
-                
+                # Now test contextual chat; the upload response is only sent
+                # once the file is parsed and embedded, so no pause is needed
                 data = {'message': 'Summarize the construction project schedule and budget'}
-                chat_response = requests.post(f"{self.backend_url}/chat", data=data, timeout=30)
+                chat_response = self.session.post(f"{self.backend_url}/chat", data=data, timeout=self.SLOW_TIMEOUT)
                 
                 if chat_response.status_code == 200:
-                    response_data = chat_response.json()
+                    response_data = _json(chat_response)
                     chat_text = response_data.get('response', '')
                     
                     # Check if response includes context from uploaded file
-                    has_context = any(word in chat_text.lower() for word in ['construction', 'schedule', 'budget', 'phase', 'week'])
+                    has_context = CONTEXT_KEYWORDS_RE.search(chat_text) is not None
                     
                     self.log_test(
                         "Contextual Chat", 
@@ -308,11 +425,51 @@ Project Manager: John Smith
             else:
                 self.log_test("Contextual Chat", False, f"Upload HTTP {upload_response.status_code}")
                 return False
-        except Exception as e:
+        except (requests.exceptions.RequestException, ValueError, AttributeError) as e:
             self.log_test("Contextual Chat", False, str(e))
             return False
 
+    def _run_test(self, output, test_func, after=None, gate=None):
+        """
+        Run one test on a worker thread, once the test it depends on has finished
+
+        When a gating test is given and it failed, the test is skipped
+        without any network I/O.
+        """
+        if after is not None:
+            wait([after])
+        if gate is not None:
+            gate_future, result_name, reason = gate
+            try:
+                gate_passed = gate_future.result()[0]
+            except Exception:
+                gate_passed = False
+            if not gate_passed:
+                return output.run_captured(lambda: self.log_test(result_name, False, f"skipped: {reason}"))
+        return output.run_captured(test_func)
+
     def run_validation(self):
+        """Run all validation tests, closing the shared session afterwards"""
+        try:
+            return self._run_validation()
+        finally:
+            self._warn_without_reuse()
+            self.session.close()
+
+    def _warn_without_reuse(self):
+        """Diagnostic only: warn when a service's pool opened a new connection for every request"""
+        for url in (self.backend_url, self.frontend_url):
+            try:
+                pools = self.session.get_adapter(url).poolmanager.pools
+                counts = [(pools[key].num_requests, pools[key].num_connections) for key in pools.keys()]
+            except (AttributeError, KeyError):
+                return  # urllib3 internals changed; skip the diagnostic
+            for num_requests, num_connections in counts:
+                if num_requests > 1 and num_connections >= num_requests:
+                    print(f"{Colors.YELLOW}⚠️  No keep-alive reuse for {url}: "
+                          f"{num_connections} connections for {num_requests} requests{Colors.ENDC}")
+
+    def _run_validation(self):
         """Run all validation tests"""
         print(f"\n{Colors.HEADER}{'='*60}{Colors.ENDC}")
         print(f"{Colors.HEADER}{Colors.BOLD}   🧪 END-TO-END INTEGRATION VALIDATION   {Colors.ENDC}")
@@ -338,32 +495,54 @@ Project Manager: John Smith
         total_tests = 0
         passed_tests = 0
         
-        for category, test_functions in tests:
-            print(f"\n{Colors.CYAN}{'='*30} {category} {'='*30}{Colors.ENDC}")
-            
-            for test_func in test_functions:
-                try:
-                    result = test_func()
-                    total_tests += 1
-                    if result:
-                        passed_tests += 1
-                    time.sleep(0.5)  # Small delay between tests
-                except Exception as e:
-                    print(f"{Colors.RED}❌ Test error: {str(e)}{Colors.ENDC}")
-                    total_tests += 1
-
-        # Print summary
-        print(f"\n{Colors.HEADER}{'='*60}{Colors.ENDC}")
-        print(f"{Colors.HEADER}{Colors.BOLD}   📊 VALIDATION SUMMARY   {Colors.ENDC}")
-        print(f"{Colors.HEADER}{'='*60}{Colors.ENDC}")
+        # Start every test at once; each one's output is held and replayed
+        # below in the order listed, so the log reads the same as a serial run
+        output = _TestOutput(sys.stdout)
+        sys.stdout = output
+        try:
+            with ThreadPoolExecutor(max_workers=MAX_WORKERS) as pool:
+                futures = {}
+                for _, test_functions in tests:
+                    for test_func in test_functions:
+                        after = futures.get(TEST_DEPENDENCIES.get(test_func.__name__))
+                        gate = TEST_GATES.get(test_func.__name__)
+                        if gate is not None:
+                            gate_test, result_name = gate
+                            gate = (futures[gate_test], result_name, GATE_REASONS[gate_test])
+                        futures[test_func.__name__] = pool.submit(self._run_test, output, test_func, after, gate)
+                
+                for category, test_functions in tests:
+                    print(f"\n{Colors.CYAN}{'='*30} {category} {'='*30}{Colors.ENDC}")
+                    
+                    for test_func in test_functions:
+                        try:
+                            result, text = futures[test_func.__name__].result()
+                            sys.stdout.write(text)
+                            total_tests += 1
+                            if result:
+                                passed_tests += 1
+                        except Exception as e:
+                            print(f"{Colors.RED}❌ Test error: {str(e)}{Colors.ENDC}")
+                            total_tests += 1
+        finally:
+            sys.stdout = output._stream
+
+        # Print summary, collected and written in one go
+        lines = [
+            f"\n{Colors.HEADER}{'='*60}{Colors.ENDC}",
+            f"{Colors.HEADER}{Colors.BOLD}   📊 VALIDATION SUMMARY   {Colors.ENDC}",
+            f"{Colors.HEADER}{'='*60}{Colors.ENDC}",
+        ]
         
-        for test_name, success, details, _ in self.test_results:
-            status = f"{Colors.GREEN}✅{Colors.ENDC}" if success else f"{Colors.RED}❌{Colors.ENDC}"
-            print(f"{status} {test_name}")
-            if not success and details:
-                print(f"   └─ {Colors.YELLOW}{details}{Colors.ENDC}")
+        for result in self.test_results:
+            status = _OK if result.success else _FAIL
+            lines.append(f"{status} {result.name}")
+            if not result.success and result.details:
+                lines.append(f"   └─ {Colors.YELLOW}{result.details}{Colors.ENDC}")
 
-        print(f"\n{Colors.CYAN}Results: {passed_tests}/{total_tests} tests passed{Colors.ENDC}")
+        lines.append(f"\n{Colors.CYAN}Results: {passed_tests}/{total_tests} tests passed{Colors.ENDC}")
+        sys.stdout.write("\n".join(lines) + "\n")
+        sys.stdout.flush()
         
         if passed_tests == total_tests:
             print(f"{Colors.GREEN}{Colors.BOLD}🎉 ALL TESTS PASSED - INTEGRATION SUCCESSFUL!{Colors.ENDC}")
@@ -384,10 +563,13 @@ def main():
     
     validator = IntegrationValidator()
     
-    # Quick check if services are up
+    # Quick check if services are up; the two probes are independent, so run them together
     try:
-        backend_check = requests.get(f"{validator.backend_url}/health", timeout=5)
-        frontend_check = requests.get(f"{validator.frontend_url}", timeout=5)
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            backend_future = pool.submit(validator.session.get, f"{validator.backend_url}/health", timeout=validator.FAST_TIMEOUT)
+            frontend_future = pool.submit(validator.session.head, validator.frontend_url, timeout=validator.FAST_TIMEOUT, allow_redirects=True)
+        backend_check = backend_future.result()
+        frontend_check = frontend_future.result()
         
         if backend_check.status_code != 200:
             print(f"{Colors.RED}❌ Backend not accessible at {validator.backend_url}{Colors.ENDC}")
@@ -401,6 +583,10 @@ def main():
             
         print(f"{Colors.GREEN}✅ Both services are running!{Colors.ENDC}")
         
+        # The suite's health and frontend tests reuse these responses
+        validator._cached_health = _json(backend_check)
+        validator._cached_frontend = frontend_check
+        
     except Exception as e:
         print(f"{Colors.RED}❌ Error checking services: {e}{Colors.ENDC}")
         print(f"{Colors.YELLOW}💡 Make sure both backend and frontend are running{Colors.ENDC}")